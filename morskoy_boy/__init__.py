@@ -0,0 +1,11 @@
+"""Morskoy Boy (sea battle).
+
+The rules live in :mod:`morskoy_boy.engine` and do not need pygame, so the package can be
+imported without opening a window. The pygame front end is :mod:`morskoy_boy.game`,
+run it with ``python -m morskoy_boy``.
+"""
+from morskoy_boy import engine
+from morskoy_boy.engine import *
+from morskoy_boy.bitboard import BitBoard, BitAutoShips, mask_from_blocks, blocks_from_mask
+
+__all__ = engine.__all__ + ['BitBoard', 'BitAutoShips', 'mask_from_blocks', 'blocks_from_mask']
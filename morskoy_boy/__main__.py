@@ -0,0 +1,34 @@
+import argparse
+
+import pygame
+
+from morskoy_boy.game import main, replay, instrument_game
+from morskoy_boy.instrument import Profiler, NULL_PROFILER, ENV_VARIABLE, profile_file_from_env
+from morskoy_boy.matchlog import MatchLog, read_matches
+from morskoy_boy.strategies import STRATEGIES
+
+parser = argparse.ArgumentParser(prog='python -m morskoy_boy')
+parser.add_argument('--computer', nargs='?', const='density', choices=sorted(STRATEGIES),
+                    help='let the computer play for PLAYER2 with this strategy (default: density)')
+parser.add_argument('--fps', type=int, default=30, help='maximum frames per second (default: 30)')
+parser.add_argument('--log', metavar='FILE', help='append the match to this log')
+parser.add_argument('--replay', metavar='FILE', help='show the last match of this log instead of playing')
+parser.add_argument('--profile', metavar='FILE', default=profile_file_from_env(),
+                    help=f'write frame timings and call counts to FILE (.json or .csv), '
+                         f'also enabled by the {ENV_VARIABLE} environment variable')
+args = parser.parse_args()
+profiler = Profiler() if args.profile else NULL_PROFILER
+if args.profile:
+    instrument_game(profiler)
+opponent = STRATEGIES[args.computer](0) if args.computer else None
+if args.replay:
+    replay(read_matches(args.replay)[-1], args.fps)
+elif args.log:
+    with MatchLog(args.log) as log:
+        main(opponent, args.fps, log, profiler)
+else:
+    main(opponent, args.fps, profiler=profiler)
+if args.profile:
+    profiler.unpatch()
+    profiler.dump(args.profile)
+pygame.quit()
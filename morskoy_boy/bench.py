@@ -0,0 +1,305 @@
+"""Benchmarks of the engine and of the drawing functions.
+
+Run ``python -m morskoy_boy.bench`` to time every benchmark and compare the results with
+bench_baseline.json; the exit status is 1 if any benchmark got slower than the baseline by
+more than the threshold. ``--save-baseline`` stores the current results as the new
+baseline. Drawing is timed on an off-screen display (SDL_VIDEODRIVER=dummy), so it
+measures the Python and blitting work, not the video driver.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from morskoy_boy.engine import (BoardConfig, AutoShips, FleetIndex, GameState, PlacementHistory, check_hit_or_miss,
+                                update_dotted_and_hit_sets, update_used_blocks, restore_used_blocks, files_ships_function)
+
+BASELINE_FILE = 'bench_baseline.json'
+# a benchmark may take this many times its baseline before it counts as a regression
+DEFAULT_THRESHOLD = 1.5
+# seconds a run of a benchmark should take at least
+MIN_RUN_TIME = 0.05
+GROUPS = ('engine', 'mega', 'draw')
+# the "mega board" event: 1000x1000 grids with a thousand ships each
+MEGA = BoardConfig(1000, 1000, (4,) * 100 + (3,) * 200 + (2,) * 300 + (1,) * 400)
+BENCHMARKS = {}
+
+
+def benchmark(group, number):
+    """Registers a benchmark
+
+    The decorated function prepares one operation and returns it as a function without
+    arguments; only calls of the returned function are timed.
+
+    :param group: one of GROUPS
+    :type group: str
+    :param number: operations timed together in one repeat
+    :type number: int
+    """
+    def register(prepare):
+        BENCHMARKS[prepare.__name__] = (group, number, prepare)
+        return prepare
+    return register
+
+
+def sample_fleet(offset=0):
+    return AutoShips(offset).ships
+
+
+def all_blocks(offset=0):
+    blocks = [(x, y) for x in range(1 + offset, 11 + offset) for y in range(1, 11)]
+    random.shuffle(blocks)
+    return blocks
+
+
+@benchmark('engine', 200)
+def auto_ships():
+    return lambda: AutoShips(0)
+
+
+@benchmark('engine', 50)
+def check_hit_or_miss_list():
+    ships = sample_fleet(15)
+    ships_working = [ship[:] for ship in ships]
+    ships_set = set(block for ship in ships for block in ship)
+    state = GameState()
+    blocks = all_blocks(15)
+
+    def run():
+        for block in blocks:
+            check_hit_or_miss(block, ships_working, False, ships, ships_set, state)
+    return run
+
+
+@benchmark('engine', 50)
+def check_hit_or_miss_index():
+    ships = sample_fleet(15)
+    index = FleetIndex(ships)
+    ships_set = set(block for ship in ships for block in ship)
+    state = GameState()
+    blocks = all_blocks(15)
+
+    def run():
+        for block in blocks:
+            check_hit_or_miss(block, index, False, ships, ships_set, state)
+    return run
+
+
+@benchmark('engine', 50)
+def game_state_match():
+    state = GameState(sample_fleet(0), sample_fleet(15))
+    blocks = {False: all_blocks(15), True: all_blocks(0)}
+
+    def run():
+        while state.winner is None:
+            fired_block = blocks[state.player2_turn].pop()
+            if state.is_valid_shot(fired_block):
+                state.fire(fired_block)
+    return run
+
+
+@benchmark('engine', 2000)
+def dotted_and_hit_sets():
+    state = GameState()
+    block = random.choice(all_blocks(15))
+    return lambda: update_dotted_and_hit_sets(block, False, False, state)
+
+
+@benchmark('engine', 2000)
+def used_blocks():
+    ship = random.choice(sample_fleet())
+    used_blocks_set = set()
+
+    def run():
+        update_used_blocks(ship, used_blocks_set)
+        restore_used_blocks(ship, used_blocks_set)
+    return run
+
+
+@benchmark('engine', 2000)
+def placement_undo_redo():
+    history = PlacementHistory()
+    for ship in sample_fleet():
+        history.place(ship)
+
+    def run():
+        history.undo()
+        history.redo()
+    return run
+
+
+@benchmark('engine', 200)
+def fleet_file():
+    return lambda: files_ships_function('player1_grid.txt')
+
+
+@benchmark('mega', 3)
+def mega_auto_ships():
+    return lambda: AutoShips(0, MEGA)
+
+
+@benchmark('mega', 3)
+def mega_shots():
+    state = GameState(AutoShips(0, MEGA).ships, AutoShips(MEGA.player2_offset, MEGA).ships, MEGA)
+    rng = random.Random(0)
+    blocks = {False: [(rng.randint(1, MEGA.width) + MEGA.player2_offset, rng.randint(1, MEGA.height))
+                      for _ in range(5000)],
+              True: [(rng.randint(1, MEGA.width), rng.randint(1, MEGA.height)) for _ in range(5000)]}
+
+    def run():
+        for _ in range(5000):
+            fired_block = blocks[state.player2_turn].pop()
+            if state.is_valid_shot(fired_block):
+                state.fire(fired_block)
+    return run
+
+
+def game_module():
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from morskoy_boy import game
+    return game
+
+
+@benchmark('draw', 200)
+def draw_dots():
+    game = game_module()
+    dots = set(all_blocks(15)[:50])
+    return lambda: game.draw_from_dotted_set(dots)
+
+
+@benchmark('draw', 200)
+def draw_hits():
+    game = game_module()
+    hits = set(all_blocks(15)[:20])
+    return lambda: game.draw_hit_blocks(hits)
+
+
+@benchmark('draw', 200)
+def draw_fleet():
+    game = game_module()
+    ships = sample_fleet(0)
+    return lambda: game.draw_ships(ships)
+
+
+@benchmark('draw', 50)
+def draw_grid():
+    game = game_module()
+    return lambda: game.Grid('PLAYER1', 0)
+
+
+@benchmark('draw', 200)
+def draw_grids_background():
+    game = game_module()
+    return game.draw_grids
+
+
+def measure(prepare, number, repeat):
+    """Best time of one operation over repeat runs of at least number operations
+
+    number is raised until one run takes MIN_RUN_TIME, so short operations are not lost
+    in timer noise.
+
+    :rtype: float
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        operations = [prepare() for _ in range(number)]
+        start_time = time.perf_counter()
+        for operation in operations:
+            operation()
+        seconds = time.perf_counter() - start_time
+        best = min(best, seconds / number)
+        if seconds < MIN_RUN_TIME:
+            number = int(number * MIN_RUN_TIME / max(seconds, 1e-6)) + 1
+    return best
+
+
+def run_benchmarks(names=None, groups=GROUPS, repeat=7):
+    """Times benchmarks
+
+    :param names: benchmarks to run. Defaults to None (all of them in groups)
+    :type names: Iterable[str]
+    :param groups: groups of benchmarks to run
+    :type groups: Iterable[str]
+    :param repeat: runs of every benchmark, the best one counts
+    :type repeat: int
+    :return: report with the seconds per operation of every benchmark
+    :rtype: dict
+    :raises Warning: if a benchmark name is unknown
+    """
+    names = [name for name, (group, _, _) in BENCHMARKS.items() if group in groups] if names is None else list(names)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise Warning(f"unknown benchmark {name}, choose from {sorted(BENCHMARKS)}")
+    results = {}
+    for name in names:
+        group, number, prepare = BENCHMARKS[name]
+        seconds = measure(prepare, number, repeat)
+        results[name] = {'group': group, 'seconds': seconds, 'per_second': 1 / seconds if seconds else 0.0}
+    return {'python': platform.python_version(), 'machine': platform.machine(), 'results': results}
+
+
+def compare(report, baseline, threshold=None):
+    """Compares a report with a baseline report
+
+    :param report: report of run_benchmarks
+    :type report: dict
+    :param baseline: earlier report, may hold its own 'threshold'
+    :type baseline: dict
+    :param threshold: allowed slowdown factor. Defaults to None (the baseline's or DEFAULT_THRESHOLD)
+    :type threshold: float
+    :return: benchmark name -> {'ratio': current / baseline time, 'regression': bool}, for
+        benchmarks that are in both reports
+    :rtype: dict[str, dict]
+    """
+    if threshold is None:
+        threshold = baseline.get('threshold', DEFAULT_THRESHOLD)
+    comparison = {}
+    for name, result in report['results'].items():
+        if name in baseline['results']:
+            ratio = result['seconds'] / baseline['results'][name]['seconds']
+            comparison[name] = {'ratio': ratio, 'regression': ratio > threshold}
+    return comparison
+
+
+def print_report(report, comparison):
+    for name, result in report['results'].items():
+        line = f"{result['group']:6} {name:24} {result['seconds'] * 1e6:10.2f} us"
+        if name in comparison:
+            line += f"  x{comparison[name]['ratio']:.2f} of baseline"
+            if comparison[name]['regression']:
+                line += '  REGRESSION'
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m morskoy_boy.bench', description=__doc__.splitlines()[0])
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+    parser.add_argument('--group', choices=GROUPS, action='append', help='only run this group')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f'baseline to compare with (default: {BASELINE_FILE})')
+    parser.add_argument('--threshold', type=float, help='allowed slowdown factor (default: from the baseline)')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+    report = run_benchmarks(args.names or None, args.group or GROUPS, args.repeat)
+    comparison = {}
+    if args.save_baseline:
+        report['threshold'] = args.threshold or DEFAULT_THRESHOLD
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            comparison = compare(report, json.load(f), args.threshold)
+    if args.json:
+        print(json.dumps(dict(report, comparison=comparison), indent=2))
+    else:
+        print_report(report, comparison)
+    return 1 if any(result['regression'] for result in comparison.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""Compact board representation: a 10x10 grid stored in a 100-bit int.
+
+Block (x, y) of a grid that starts at ``offset`` is bit ``(y - 1) * 10 + (x - offset - 1)``,
+so ships, misses and hits of one player are a few ints, and marking around a hit or a
+destroyed ship is a couple of bitwise operations instead of loops over tuples.
+"""
+import random
+
+from morskoy_boy.engine import AutoShips, MISS, HIT, SUNK, FLEET, CLASSIC
+
+WIDTH = 10
+HEIGHT = 10
+FULL_MASK = (1 << WIDTH * HEIGHT) - 1
+FIRST_COLUMN_MASK = sum(1 << (row * WIDTH) for row in range(HEIGHT))
+LAST_COLUMN_MASK = FIRST_COLUMN_MASK << (WIDTH - 1)
+NOT_FIRST_COLUMN_MASK = FULL_MASK & ~FIRST_COLUMN_MASK
+NOT_LAST_COLUMN_MASK = FULL_MASK & ~LAST_COLUMN_MASK
+
+
+def block_to_cell(block, offset=0):
+    """Returns the bit number of a block
+
+    :param block: block
+    :type block: tuple[int, int]
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: int
+    """
+    return (block[1] - 1) * WIDTH + block[0] - offset - 1
+
+
+def cell_to_block(cell, offset=0):
+    """Returns the block of a bit number
+
+    :param cell: bit number
+    :type cell: int
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: tuple[int, int]
+    """
+    return cell % WIDTH + offset + 1, cell // WIDTH + 1
+
+
+def mask_from_blocks(blocks, offset=0):
+    """Packs blocks into a mask
+
+    :param blocks: blocks
+    :type blocks: Iterable[tuple[int, int]]
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: int
+    """
+    mask = 0
+    for block in blocks:
+        mask |= 1 << block_to_cell(block, offset)
+    return mask
+
+
+def iter_cells(mask):
+    """Yields the numbers of set bits, lowest first
+
+    :param mask: mask
+    :type mask: int
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def blocks_from_mask(mask, offset=0):
+    """Unpacks a mask into a set of blocks
+
+    :param mask: mask
+    :type mask: int
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: set[tuple[int, int]]
+    """
+    return set(cell_to_block(cell, offset) for cell in iter_cells(mask))
+
+
+def halo_mask(mask):
+    """Returns the mask together with all blocks around it (the 3x3 neighbourhood of every bit)
+
+    :param mask: mask
+    :type mask: int
+    :rtype: int
+    """
+    halo = mask | ((mask << 1) & NOT_FIRST_COLUMN_MASK) | ((mask >> 1) & NOT_LAST_COLUMN_MASK)
+    return (halo | (halo << WIDTH) | (halo >> WIDTH)) & FULL_MASK
+
+
+def diagonal_mask(cell):
+    """Returns the (up to four) blocks diagonal to a cell
+
+    :param cell: bit number
+    :type cell: int
+    :rtype: int
+    """
+    bit = 1 << cell
+    sides = ((bit << 1) & NOT_FIRST_COLUMN_MASK) | ((bit >> 1) & NOT_LAST_COLUMN_MASK)
+    return ((sides << WIDTH) | (sides >> WIDTH)) & FULL_MASK
+
+
+NEIGHBOUR_MASKS = tuple(halo_mask(1 << cell) for cell in range(WIDTH * HEIGHT))
+DIAGONAL_MASKS = tuple(diagonal_mask(cell) for cell in range(WIDTH * HEIGHT))
+VERTICAL_SHIP_MASKS = tuple(sum(1 << (i * WIDTH) for i in range(length)) for length in range(HEIGHT + 1))
+# random draws to try before picking a set bit out of a sparse mask by counting
+RANDOM_TRIES = 8
+
+
+def pick_random_bit(mask, size, rng=random):
+    """Returns the number of a uniformly chosen set bit of a non-empty mask
+
+    :param mask: mask
+    :type mask: int
+    :param size: number of bits the mask can have
+    :type size: int
+    :param rng: source of randomness (random module or random.Random)
+    :rtype: int
+    """
+    for _ in range(RANDOM_TRIES):
+        ind = int(rng.random() * size)
+        if mask >> ind & 1:
+            return ind
+    skip = int(rng.random() * mask.bit_count())
+    for ind in iter_cells(mask):
+        if not skip:
+            return ind
+        skip -= 1
+
+
+class BitBoard:
+    """One player's grid: ships, misses and hits as 100-bit masks
+
+    :param ships: ships' coordinates
+    :type ships: list[list]
+    :param offset: where the grid starts
+    :type offset: int
+    :param ship_masks: a mask per ship
+    :type ship_masks: list[int]
+    :param fleet: all ships' blocks
+    :type fleet: int
+    :param dotted: missed blocks and blocks around hit ones
+    :type dotted: int
+    :param hits: blocks that were hit
+    :type hits: int
+    """
+    def __init__(self, ships, offset=0):
+        self.offset = offset
+        self.ship_masks = [mask_from_blocks(ship, offset) for ship in ships]
+        self.fleet = 0
+        self.ship_at = [None] * (WIDTH * HEIGHT)
+        for ind, ship_mask in enumerate(self.ship_masks):
+            self.fleet |= ship_mask
+            for cell in iter_cells(ship_mask):
+                self.ship_at[cell] = ind
+        self.dotted = 0
+        self.hits = 0
+
+    def fire(self, fired_block):
+        """Bitboard version of check_hit_or_miss
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :return: MISS, HIT or SUNK
+        :rtype: str
+        :raises Warning: if the block is not on this grid or was already shot at
+        """
+        x, y = fired_block
+        if not (self.offset < x <= self.offset + WIDTH and 0 < y <= HEIGHT):
+            raise Warning(f"block {fired_block} is not on the grid")
+        return self.fire_at_cell(block_to_cell(fired_block, self.offset))
+
+    def fire_at_cell(self, cell):
+        """Fires at a bit number, marks the blocks around a hit or destroyed ship as dotted
+
+        :param cell: bit number
+        :type cell: int
+        :return: MISS, HIT or SUNK
+        :rtype: str
+        :raises Warning: if the cell was already shot at or dotted
+        """
+        bit = 1 << cell
+        if (self.dotted | self.hits) & bit:
+            raise Warning(f"cell {cell} was already shot at")
+        ind = self.ship_at[cell]
+        if ind is None:
+            self.dotted |= bit
+            return MISS
+        self.hits |= bit
+        ship_mask = self.ship_masks[ind]
+        if ship_mask & ~self.hits:
+            self.dotted = (self.dotted | DIAGONAL_MASKS[cell]) & ~self.hits
+            return HIT
+        self.dotted = (self.dotted | halo_mask(ship_mask)) & ~self.hits
+        return SUNK
+
+    def check_hit_or_miss(self, fired_block, player2_turn):
+        """Same answer as engine's check_hit_or_miss for a block that was not shot at yet:
+        whether it is player2's turn after the shot. Unlike the list version, shooting
+        at a hit or dotted block again raises Warning instead of counting as a miss.
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :param player2_turn: turn of player2 or  player1
+        :type player2_turn: bool
+        :rtype: bool
+        """
+        if self.fire(fired_block) == MISS:
+            return not player2_turn
+        return player2_turn
+
+    @property
+    def all_sunk(self):
+        """True when every ship's block was hit"""
+        return not self.fleet & ~self.hits
+
+
+class BitAutoShips(AutoShips):
+    """AutoShips that keeps the available blocks in a mask and builds ships as masks
+
+    Ships are drawn the same way as in AutoShips (random available start block, random
+    direction, bouncing off the edge), but a rejected ship costs a couple of int operations.
+
+    :param available_mask: blocks that are available for creating ships
+    :type available_mask: int
+    :param fleet_mask: blocks of all created ships
+    :type fleet_mask: int
+    :param ship_masks: a mask per ship
+    :type ship_masks: list[int]
+    """
+    def __init__(self, offset):
+        self.offset = offset
+        self.config = CLASSIC
+        self.available_mask = FULL_MASK
+        self.fleet_mask = 0
+        self.ship_masks = []
+        self.ships_set = set()
+        self.ships = self.populate_grid()
+
+    def create_ship_mask(self, number_of_blocks):
+        while True:
+            cell = pick_random_bit(self.available_mask, WIDTH * HEIGHT)
+            x, y = cell % WIDTH, cell // WIDTH
+            x_or_y = random.random() < 0.5
+            coor, last = (y, HEIGHT) if x_or_y else (x, WIDTH)
+            if random.random() < 0.5:
+                start = min(coor, last - number_of_blocks)
+            else:
+                start = max(coor - number_of_blocks + 1, 0)
+            if x_or_y:
+                ship_mask = VERTICAL_SHIP_MASKS[number_of_blocks] << (start * WIDTH + x)
+            else:
+                ship_mask = ((1 << number_of_blocks) - 1) << (y * WIDTH + start)
+            if not ship_mask & ~self.available_mask:
+                return ship_mask
+
+    def populate_grid(self):
+        ships_coordinates_list = []
+        for number_of_blocks in FLEET:
+            ship_mask = self.create_ship_mask(number_of_blocks)
+            new_ship = [cell_to_block(cell, self.offset) for cell in iter_cells(ship_mask)]
+            ships_coordinates_list.append(new_ship)
+            self.ship_masks.append(ship_mask)
+            self.fleet_mask |= ship_mask
+            self.available_mask &= ~halo_mask(ship_mask)
+            self.ships_set.update(new_ship)
+        return ships_coordinates_list
@@ -0,0 +1,142 @@
+"""Memory-mapped corpora of fleet layouts.
+
+A corpus file is a layout file (see morskoy_boy.layouts): 13-byte layouts back to back.
+LayoutCorpus maps it into memory instead of reading it, so tens of millions of layouts
+cost nothing until they are used. Batches are NumPy views straight into the mapping, and
+any layout can be decoded by its index for sampling.
+"""
+import mmap
+
+import numpy as np
+
+from morskoy_boy.layouts import RECORD_SIZE, decode_fleet
+from morskoy_boy.bitboard import WIDTH, HEIGHT
+
+
+def grids_to_records(grids):
+    """Packs occupancy grids into layouts
+
+    :param grids: occupancy grids of shape (n, 10, 10), like generate_fleets returns
+    :type grids: np.ndarray
+    :return: layouts of shape (n, 13)
+    :rtype: np.ndarray
+    """
+    grids = np.asarray(grids, dtype=np.uint8).reshape(-1, WIDTH * HEIGHT)
+    return np.packbits(grids, axis=1, bitorder='little')
+
+
+def records_to_grids(records):
+    """Unpacks layouts into occupancy grids
+
+    :param records: layouts of shape (n, 13)
+    :type records: np.ndarray
+    :return: occupancy grids of shape (n, 10, 10)
+    :rtype: np.ndarray
+    """
+    grids = np.unpackbits(records, axis=1, count=WIDTH * HEIGHT, bitorder='little')
+    return grids.reshape(-1, HEIGHT, WIDTH)
+
+
+def write_corpus(file, grids, append=False):
+    """Writes occupancy grids to a corpus file
+
+    The grids are not validated, pass fleets from generate_fleets or a checked source.
+
+    :param file: file
+    :type file: str
+    :param grids: occupancy grids of shape (n, 10, 10)
+    :type grids: np.ndarray
+    :param append: add to the end of the file instead of overwriting it
+    :type append: bool
+    :return: number of layouts written
+    :rtype: int
+    """
+    records = grids_to_records(grids)
+    with open(file, 'ab' if append else 'wb') as f:
+        f.write(records.tobytes())
+    return len(records)
+
+
+class LayoutCorpus:
+    """Read-only view of a corpus file
+
+    :param file: file
+    :type file: str
+    :param offset: where the grids of decoded fleets start
+    :type offset: int
+    :param records: all layouts, shape (len(self), 13), backed by the mapping
+    :type records: np.ndarray
+    :raises Warning: if the file size is not a multiple of the layout size
+    """
+    def __init__(self, file, offset=0):
+        self.offset = offset
+        with open(file, 'rb') as f:
+            size = f.seek(0, 2)
+            if size % RECORD_SIZE:
+                raise Warning(f"{file} is not a sequence of {RECORD_SIZE}-byte layouts")
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self.mmap is None:
+            self.records = np.zeros((0, RECORD_SIZE), dtype=np.uint8)
+        else:
+            self.records = np.frombuffer(self.mmap, dtype=np.uint8).reshape(-1, RECORD_SIZE)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        """Decodes one layout
+
+        :param index: index, negative counts from the end
+        :type index: int
+        :return: [ships, ships_set], like files_ships_function
+        :rtype: list
+        """
+        return decode_fleet(self.records[index].tobytes(), self.offset)
+
+    def __iter__(self):
+        for records in self.batches():
+            for record in records:
+                yield decode_fleet(record.tobytes(), self.offset)
+
+    def batches(self, batch_size=65536, start=0, stop=None):
+        """Yields consecutive layouts as zero-copy views of shape (batch_size, 13)
+
+        :param batch_size: layouts per batch, the last batch may be shorter
+        :type batch_size: int
+        :param start: index of the first layout
+        :type start: int
+        :param stop: index after the last layout. Defaults to None (the end of the corpus)
+        :type stop: int
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for batch_start in range(start, stop, batch_size):
+            yield self.records[batch_start:min(batch_start + batch_size, stop)]
+
+    def sample(self, n, rng=None):
+        """Decodes n layouts picked at random, with replacement
+
+        :param n: number of layouts
+        :type n: int
+        :param rng: seed or numpy Generator. Defaults to None (fresh entropy)
+        :type rng: int | np.random.Generator
+        :rtype: list[list]
+        """
+        indexes = np.random.default_rng(rng).integers(len(self), size=n)
+        return [self[int(index)] for index in indexes]
+
+    def close(self):
+        """Unmaps the file, or leaves that to the last batch still in use being freed"""
+        self.records = np.zeros((0, RECORD_SIZE), dtype=np.uint8)
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                # batches handed out earlier keep the mapping alive until they are freed
+                pass
+            self.mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
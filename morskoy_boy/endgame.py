@@ -0,0 +1,403 @@
+"""Exact endgame solver.
+
+Once only a few ships are left, every layout of the remaining ships that agrees with the
+dotted and hit blocks of the opponent's grid can be listed. Taking those layouts as equally
+likely, the solver looks for the shot that minimises the expected number of shots until all
+of them are sunk. Every remaining ship cell costs one shot whatever the order, so that is
+the shot with the fewest expected misses. The search runs over shots and their results
+(miss, hit or which ship was sunk), one shot deeper per iteration, until its value is exact
+or the time budget is spent; the last finished iteration decides. Search states are stored
+in a bounded transposition table under a 64-bit Zobrist hash of the missed, hit and sunk
+cells.
+
+``analyse_match`` replays a logged match and compares every endgame shot with the solver's
+choice.
+"""
+import collections
+import random
+import time
+
+from morskoy_boy.engine import MISS, HIT, SUNK, FLEET
+from morskoy_boy.bitboard import (WIDTH, HEIGHT, FULL_MASK, NOT_FIRST_COLUMN_MASK, NOT_LAST_COLUMN_MASK,
+                                  block_to_cell, cell_to_block, iter_cells)
+from morskoy_boy.matchlog import replay_steps
+from morskoy_boy.placement import default_table
+
+# the solver only takes over when at most this many layouts are consistent with the grid
+MAX_LAYOUTS = 2000
+# search states kept in the transposition table
+TABLE_SIZE = 1 << 16
+_zobrist_rng = random.Random(21)
+ZOBRIST_MISS, ZOBRIST_HIT, ZOBRIST_SUNK = (tuple(_zobrist_rng.getrandbits(64) for _ in range(WIDTH * HEIGHT))
+                                           for _ in range(3))
+
+
+class _Timeout(Exception):
+    pass
+
+
+def orthogonal_mask(mask):
+    """Returns the blocks left, right, above and below the bits of a mask, without the mask
+
+    :param mask: mask
+    :type mask: int
+    :rtype: int
+    """
+    sides = ((mask << 1) & NOT_FIRST_COLUMN_MASK) | ((mask >> 1) & NOT_LAST_COLUMN_MASK)
+    return (sides | (mask << WIDTH) | (mask >> WIDTH)) & FULL_MASK & ~mask
+
+
+def hit_components(hits):
+    """Splits hit cells into groups of orthogonally connected cells, one group per ship
+
+    :param hits: hit cells
+    :type hits: int
+    :rtype: list[int]
+    """
+    components = []
+    while hits:
+        component = hits & -hits
+        grown = (component | orthogonal_mask(component)) & hits
+        while grown != component:
+            component = grown
+            grown = (component | orthogonal_mask(component)) & hits
+        components.append(component)
+        hits &= ~component
+    return components
+
+
+def consistent_layouts(lengths, blocked, wounded, max_layouts=MAX_LAYOUTS, table=default_table):
+    """Lists the layouts of ships that agree with a grid
+
+    :param lengths: lengths of the ships that are not sunk
+    :type lengths: Iterable[int]
+    :param blocked: cells that hold no ship of lengths: dotted cells and sunk ships
+    :type blocked: int
+    :param wounded: hit cells of ships that are not sunk, each must be covered
+    :type wounded: int
+    :param max_layouts: give up after this many layouts
+    :type max_layouts: int
+    :param table: placement table
+    :type table: PlacementTable
+    :return: (cells of all ships, ship masks) per layout, or None if there are more than
+        max_layouts
+    :rtype: list[tuple[int, tuple[int]]] | None
+    """
+    lengths = sorted(lengths, reverse=True)
+    candidates = {length: [(ship_mask, ship_halo) for ship_mask, ship_halo in table.placements[length]
+                           if not ship_mask & blocked and ship_mask & ~wounded]
+                  for length in set(lengths)}
+    layouts = []
+
+    def place(ind, start, occupied, cells, ships):
+        if ind == len(lengths):
+            if not wounded & ~cells:
+                layouts.append((cells, ships))
+            return len(layouts) <= max_layouts
+        length = lengths[ind]
+        if not ind or lengths[ind - 1] != length:
+            start = 0
+        length_candidates = candidates[length]
+        for number in range(start, len(length_candidates)):
+            ship_mask, ship_halo = length_candidates[number]
+            if not ship_mask & occupied:
+                if not place(ind + 1, number + 1, occupied | ship_halo, cells | ship_mask, ships + (ship_mask,)):
+                    return False
+        return True
+
+    return layouts if place(0, 0, 0, 0, ()) else None
+
+
+def grid_view(state, player2_turn):
+    """Returns what a player sees of the grid they shoot at
+
+    :param state: match
+    :type state: GameState
+    :param player2_turn: whether the player is player2
+    :type player2_turn: bool
+    :return: dotted cells and hit cells
+    :rtype: tuple[int, int]
+    """
+    offset = 0 if player2_turn else state.config.player2_offset
+    masks = []
+    for blocks in (state.dotted_set, state.hit_blocks):
+        mask = 0
+        for block in blocks:
+            if offset < block[0] <= offset + WIDTH and 0 < block[1] <= HEIGHT:
+                mask |= 1 << block_to_cell(block, offset)
+        masks.append(mask)
+    return tuple(masks)
+
+
+class EndgameSolver:
+    """Finds the shots that finish the remaining ships in the fewest expected shots
+
+    :param layouts: layouts that agree with the grid, see consistent_layouts
+    :type layouts: list[tuple[int, tuple[int]]]
+    :param missed: cells known to hold no ship
+    :type missed: int
+    :param hits: hit cells
+    :type hits: int
+    :param sunk: cells of sunk ships
+    :type sunk: int
+    :param time_budget: seconds a search may take
+    :type time_budget: float
+    :param table_size: states kept in the transposition table
+    :type table_size: int
+    :param depth: shots the last search looked ahead
+    :type depth: int
+    :param exact: whether the last search finished every line of play
+    :type exact: bool
+    """
+    def __init__(self, layouts, missed=0, hits=0, sunk=0, time_budget=0.05, table_size=TABLE_SIZE):
+        if not layouts:
+            raise Warning("no layout of the remaining ships agrees with the grid")
+        self.layouts = layouts
+        self.ids = tuple(range(len(layouts)))
+        self.missed = missed
+        self.hits = hits
+        self.sunk = sunk
+        self.key = 0
+        self.time_budget = time_budget
+        self.table_size = table_size
+        self.table = collections.OrderedDict()
+        self.deadline = None
+        self.depth = 0
+        self.exact = False
+
+    @classmethod
+    def from_view(cls, dotted, hits, fleet=FLEET, max_layouts=MAX_LAYOUTS, table=default_table, **kwargs):
+        """Builds a solver from the dotted and hit cells of a grid
+
+        A group of hit cells with only dotted cells and the edge of the grid around it is a
+        sunk ship, the other hit cells belong to ships that are still afloat.
+
+        :param dotted: dotted cells
+        :type dotted: int
+        :param hits: hit cells
+        :type hits: int
+        :param fleet: lengths of all ships of the grid
+        :type fleet: tuple[int]
+        :param max_layouts: most layouts worth solving
+        :type max_layouts: int
+        :param table: placement table
+        :type table: PlacementTable
+        :return: the solver, or None if more than max_layouts layouts agree with the grid
+        :rtype: EndgameSolver | None
+        :raises Warning: if the sunk ships or the grid do not fit the fleet
+        """
+        remaining = list(fleet)
+        sunk = 0
+        for component in hit_components(hits):
+            if not orthogonal_mask(component) & ~dotted:
+                length = bin(component).count('1')
+                if length not in remaining:
+                    raise Warning(f"a sunk ship of {length} blocks is not in the fleet {fleet}")
+                remaining.remove(length)
+                sunk |= component
+        layouts = consistent_layouts(remaining, dotted | sunk, hits & ~sunk, max_layouts, table)
+        if layouts is None:
+            return None
+        return cls(layouts, dotted, hits, sunk, **kwargs)
+
+    @property
+    def ship_cells_left(self):
+        """Cells of the remaining ships that are not hit yet"""
+        return bin(self.layouts[self.ids[0]][0] & ~self.hits).count('1')
+
+    def outcome(self, layout, bit, hits):
+        """Returns what shooting a bit tells about a layout: 0 for a miss, -1 for a hit and
+        the ship's mask when it sinks it"""
+        if not layout[0] & bit:
+            return 0
+        for ship_mask in layout[1]:
+            if ship_mask & bit:
+                return ship_mask if not ship_mask & ~hits & ~bit else -1
+
+    def split(self, ids, cell, missed, hits, sunk, key):
+        """Groups layouts by the result of a shot
+
+        :return: (share of layouts, layout ids, missed, hits, sunk, key) per result
+        :rtype: list[tuple]
+        """
+        bit = 1 << cell
+        groups = {}
+        for ind in ids:
+            groups.setdefault(self.outcome(self.layouts[ind], bit, hits), []).append(ind)
+        children = []
+        for outcome, group in groups.items():
+            share = len(group) / len(ids)
+            if outcome == 0:
+                children.append((share, tuple(group), missed | bit, hits, sunk, key ^ ZOBRIST_MISS[cell]))
+            elif outcome == -1:
+                children.append((share, tuple(group), missed, hits | bit, sunk, key ^ ZOBRIST_HIT[cell]))
+            else:
+                sunk_key = key ^ ZOBRIST_HIT[cell]
+                for ship_cell in iter_cells(outcome):
+                    sunk_key ^= ZOBRIST_SUNK[ship_cell]
+                children.append((share, tuple(group), missed, hits | bit, sunk | outcome, sunk_key))
+        return children
+
+    def candidates(self, ids, hits, first=None):
+        """Cells some layout has a ship on, most often covered first
+
+        :return: (cell, layouts covering it) pairs
+        :rtype: list[tuple[int, int]]
+        """
+        counts = collections.Counter()
+        for ind in ids:
+            counts.update(iter_cells(self.layouts[ind][0] & ~hits))
+        cells = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        if first is not None:
+            cells.sort(key=lambda item: item[0] != first)
+        return cells
+
+    def shot_value(self, cell, ids, missed, hits, sunk, key, depth, best=float('inf')):
+        """Expected misses of shooting a cell, or a value >= best once it cannot beat best
+
+        :return: (expected misses, exact)
+        :rtype: tuple[float, bool]
+        """
+        total = 0.0
+        exact = True
+        for share, child_ids, child_missed, child_hits, child_sunk, child_key in self.split(
+                ids, cell, missed, hits, sunk, key):
+            if child_hits == hits:
+                total += share
+                if total >= best:
+                    return total, exact
+            value, child_exact = self.search(child_ids, child_missed, child_hits, child_sunk, child_key, depth - 1)
+            total += share * value
+            exact = exact and child_exact
+            if total >= best:
+                return total, exact
+        return total, exact
+
+    def search(self, ids, missed, hits, sunk, key, depth):
+        """Fewest expected misses until the remaining ships are sunk, looking depth shots ahead
+
+        :return: (expected misses, exact), the misses are a lower bound if not exact
+        :rtype: tuple[float, bool]
+        :raises _Timeout: once the deadline has passed
+        """
+        if not self.layouts[ids[0]][0] & ~hits:
+            return 0.0, True
+        if not depth:
+            return 0.0, False
+        entry = self.table.get(key)
+        first = None
+        if entry is not None and entry[0] == (missed, hits, sunk):
+            self.table.move_to_end(key)
+            if entry[2] or entry[3] >= depth:
+                return entry[1], entry[2]
+            first = entry[4]
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise _Timeout
+        cells = self.candidates(ids, hits, first)
+        best, exact, best_cell = float('inf'), False, None
+        certain = [cell for cell, count in cells if count == len(ids)]
+        if certain:
+            # a cell every layout has a ship on must be shot at some time, shooting it first costs nothing
+            cells = [(certain[0], len(ids))]
+        for cell, count in cells:
+            if (len(ids) - count) / len(ids) >= best:
+                break
+            value, value_exact = self.shot_value(cell, ids, missed, hits, sunk, key, depth, best)
+            if value < best:
+                best, exact, best_cell = value, value_exact, cell
+        self.table[key] = ((missed, hits, sunk), best, exact, depth, best_cell)
+        self.table.move_to_end(key)
+        if len(self.table) > self.table_size:
+            self.table.popitem(last=False)
+        return best, exact
+
+    def evaluate(self, cells):
+        """Expected shots to finish when shooting each of cells next, deepened until exact or
+        out of time
+
+        :param cells: cells to compare
+        :type cells: Iterable[int]
+        :return: cell -> expected shots, from the last finished iteration
+        :rtype: dict[int, float]
+        """
+        cells = list(cells)
+        start_time = time.perf_counter()
+        values = {}
+        self.deadline = None
+        depth = 1
+        while True:
+            try:
+                iteration = {}
+                exact = True
+                for cell in cells:
+                    value, value_exact = self.shot_value(cell, self.ids, self.missed, self.hits, self.sunk,
+                                                         self.key, depth)
+                    iteration[cell] = value
+                    exact = exact and value_exact
+            except _Timeout:
+                break
+            values, self.depth, self.exact = iteration, depth, exact
+            if exact:
+                break
+            depth += 1
+            self.deadline = start_time + self.time_budget
+        self.deadline = None
+        left = self.ship_cells_left
+        return {cell: left + value for cell, value in values.items()}
+
+    def best_shot(self):
+        """Returns the best cell to shoot at and the expected shots to finish after it
+
+        :rtype: tuple[int, float]
+        """
+        values = self.evaluate(cell for cell, _ in self.candidates(self.ids, self.hits))
+        cell = min(values, key=values.get)
+        return cell, values[cell]
+
+    def apply(self, cell, result):
+        """Keeps the layouts that agree with the result of a shot
+
+        :param cell: cell shot at
+        :type cell: int
+        :param result: MISS, HIT or SUNK
+        :type result: str
+        :raises Warning: if no layout gives that result
+        """
+        for _, ids, missed, hits, sunk, key in self.split(self.ids, cell, self.missed, self.hits, self.sunk,
+                                                          self.key):
+            if result == (MISS if hits == self.hits else HIT if sunk == self.sunk else SUNK):
+                self.ids, self.missed, self.hits, self.sunk, self.key = ids, missed, hits, sunk, key
+                return
+        raise Warning(f"no remaining layout gives {result} at cell {cell}")
+
+
+def analyse_match(match, time_budget=0.05, max_layouts=MAX_LAYOUTS):
+    """Compares the endgame shots of a logged match with the solver's
+
+    :param match: match
+    :type match: Match
+    :param time_budget: seconds to spend on each shot
+    :type time_budget: float
+    :param max_layouts: the solver joins once at most this many layouts are consistent
+    :type max_layouts: int
+    :return: for every shot fired when the solver could play: number of the shot, player,
+        fired_block, expected shots to finish after it, best_block and its expected shots
+    :rtype: list[dict]
+    :raises Warning: like replay_steps
+    """
+    views = {False: (0, 0), True: (0, 0)}
+    report = []
+    for number, (state, (player2_turn, fired_block, result)) in enumerate(replay_steps(match)):
+        offset = 0 if player2_turn else state.config.player2_offset
+        solver = EndgameSolver.from_view(*views[player2_turn], fleet=state.config.fleet, max_layouts=max_layouts,
+                                         time_budget=time_budget)
+        views[player2_turn] = grid_view(state, player2_turn)
+        if solver is None:
+            continue
+        cell = block_to_cell(fired_block, offset)
+        best_cell, best_expected = solver.best_shot()
+        expected = solver.evaluate([cell])[cell] if cell != best_cell else best_expected
+        report.append({'shot': number, 'player': 2 if player2_turn else 1, 'block': fired_block,
+                       'expected': expected, 'best_block': cell_to_block(best_cell, offset),
+                       'best_expected': best_expected})
+    return report
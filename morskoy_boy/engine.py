@@ -0,0 +1,720 @@
+import random
+import re
+from collections import deque
+
+__all__ = ['MISS', 'HIT', 'SUNK', 'FLEET', 'BoardConfig', 'CLASSIC', 'column_name', 'AutoShips', 'FleetIndex', 'Fleet', 'GameState', 'check_hit_or_miss',
+           'add_missed_block_to_dotted_set', 'update_destroyed_ships', 'update_dotted_and_hit_sets',
+           'ship_is_valid', 'check_ships_numbers', 'update_used_blocks', 'restore_used_blocks',
+           'ship_halo', 'OccupancyGrid', 'PlacementHistory',
+           'parse_ships', 'fleet_is_valid', 'files_ships_function', 'dotted_set', 'hit_blocks']
+
+MISS = 'miss'
+HIT = 'hit'
+SUNK = 'sunk'
+# lengths of ships in a fleet: one 4-deck ship, two 3-deck, three 2-deck and four 1-deck
+FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
+
+def column_name(index):
+    """Letter of a column: A to Z, then AA, AB and so on
+
+    :param index: index of the column, from 0
+    :type index: int
+    :rtype: str
+    """
+    name = ''
+    index += 1
+    while index:
+        index, letter = divmod(index - 1, 26)
+        name = chr(ord('A') + letter) + name
+    return name
+
+
+class BoardConfig:
+    """Size of the grids and the ships of a fleet
+
+    Player2's grid starts player2_offset columns to the right of player1's, with a gap of
+    five columns like on the screen.
+
+    :param width: number of columns
+    :type width: int
+    :param height: number of rows
+    :type height: int
+    :param fleet: lengths of ships in a fleet, placed in this order
+    :type fleet: tuple[int]
+    :param player2_offset: where player2's grid starts
+    :type player2_offset: int
+    """
+    def __init__(self, width=10, height=10, fleet=FLEET):
+        self.width = width
+        self.height = height
+        self.fleet = tuple(fleet)
+        self.player2_offset = width + 5
+
+    def on_grid(self, block, offset):
+        """Checks that a block is on the grid that starts at offset
+
+        :param block: block
+        :type block: tuple[int, int]
+        :param offset: where the grid starts
+        :type offset: int
+        :rtype: bool
+        """
+        return offset < block[0] <= offset + self.width and 0 < block[1] <= self.height
+
+
+CLASSIC = BoardConfig()
+
+
+class AutoShips:
+    """ class for creating ships automatically
+
+    Only the blocks around ships that were already placed are stored, and start blocks are
+    drawn from the whole grid and redrawn when they are taken, so big grids with few ships
+    cost no more than small ones.
+
+    :param offset: where the grid starts
+    :type offset: int
+    :param config: size of the grid and ships to place. Defaults to CLASSIC
+    :type config: BoardConfig
+    :param blocked_blocks: ships' blocks and the blocks around them, where no new ship may be
+    :type blocked_blocks: set[tuple[int, int]]
+    :param ships_set: set of ships
+    :type ships_set: set
+    :param ships: list of ships
+    :type ships: list
+    :param number_of_blocks: length of a needed ship
+    :type number_of_blocks: int
+    :param coor:  x or y coordinate to increment/decrement
+    :type coor: int
+    :param str_rev: 1 or -1
+    :type str_rev: int
+    :param x_or_y: 0 or 1
+    :type x_or_y: int
+    :param ship_coordinates: coordinates of unfinished ship
+    :type ship_coordinates: list[tuple[Any, Any]]
+    :param new_ship: list of tuples with a newly created ship's coordinates
+    :type new_ship: list
+    """
+    def __init__(self, offset, config=CLASSIC):
+        self.offset = offset
+        self.config = config
+        self.blocked_blocks = set()
+        self.ships_set = set()
+        self.ships = self.populate_grid()
+
+    def create_start_block(self):
+        x_or_y = random.randint(0, 1)
+        str_rev = random.choice((-1, 1))
+        while True:
+            x = random.randint(1 + self.offset, self.config.width + self.offset)
+            y = random.randint(1, self.config.height)
+            if (x, y) not in self.blocked_blocks:
+                return x, y, x_or_y, str_rev
+
+    def create_ship(self, number_of_blocks):
+        ship_coordinates = []
+        x, y, x_or_y, str_rev = self.create_start_block()
+        for _ in range(number_of_blocks):
+            ship_coordinates.append((x, y))
+            if not x_or_y:
+                str_rev, x = self.get_new_block_to_ship(
+                    x, str_rev, x_or_y, ship_coordinates)
+            else:
+                str_rev, y = self.get_new_block_to_ship(
+                    y, str_rev, x_or_y, ship_coordinates)
+        if self.is_ship_valid(ship_coordinates):
+            return ship_coordinates
+        return self.create_ship(number_of_blocks)
+
+    def get_new_block_to_ship(self, coor, str_rev, x_or_y, ship_coordinates):
+        if x_or_y:
+            first, last = 1, self.config.height
+        else:
+            first, last = 1 + self.offset, self.config.width + self.offset
+        if (coor <= first and str_rev == -1) or (coor >= last and str_rev == 1):
+            str_rev *= -1
+            return str_rev, ship_coordinates[0][x_or_y] + str_rev
+        else:
+            return str_rev, ship_coordinates[-1][x_or_y] + str_rev
+
+    def is_ship_valid(self, new_ship):
+        return all(self.config.on_grid(block, self.offset) and block not in self.blocked_blocks
+                   for block in new_ship)
+
+    def add_new_ship_to_set(self, new_ship):
+        self.ships_set.update(new_ship)
+
+    def update_available_blocks_for_creating_ships(self, new_ship):
+        for elem in new_ship:
+            for k in range(-1, 2):
+                for m in range(-1, 2):
+                    self.blocked_blocks.add((elem[0] + k, elem[1] + m))
+
+    def populate_grid(self):
+        ships_coordinates_list = []
+        for number_of_blocks in self.config.fleet:
+            new_ship = self.create_ship(number_of_blocks)
+            ships_coordinates_list.append(new_ship)
+            self.add_new_ship_to_set(new_ship)
+            self.update_available_blocks_for_creating_ships(new_ship)
+        return ships_coordinates_list
+
+
+class FleetIndex:
+    """Finds the ship under a block and counts its decks that are still afloat
+
+    Can be passed to check_hit_or_miss instead of a list of ships, then a shot is resolved
+    with one dict lookup instead of searching every ship.
+
+    :param ships: original ships' coordinates, never changed
+    :type ships: list[list]
+    :param ship_of: block that has not been hit yet -> index of its ship in ships
+    :type ship_of: dict[tuple[int, int], int]
+    :param decks_left: number of blocks of each ship that have not been hit yet
+    :type decks_left: list[int]
+    """
+    def __init__(self, ships):
+        self.ships = ships
+        self.ship_of = {block: ind for ind, ship in enumerate(ships) for block in ship}
+        self.decks_left = [len(ship) for ship in ships]
+
+    def fire(self, fired_block):
+        """Marks the block as hit
+
+        A block that was already hit is a miss, like in the list version of check_hit_or_miss.
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :return: MISS, HIT or SUNK and the index of the hit ship in ships (None for a miss)
+        :rtype: tuple[str, int | None]
+        """
+        ind = self.ship_of.pop(fired_block, None)
+        if ind is None:
+            return MISS, None
+        self.decks_left[ind] -= 1
+        return (HIT if self.decks_left[ind] else SUNK), ind
+
+
+class Fleet:
+    """Ships of one player during a match
+
+    :param ships: original ships' coordinates, used to find a destroyed ship and to draw it
+    :type ships: list[list]
+    :param index: ship under every block that has not been hit yet
+    :type index: FleetIndex
+    :param ships_set: set of blocks that have not been hit yet
+    :type ships_set: set
+    """
+    def __init__(self, ships):
+        self.ships = ships
+        self.index = FleetIndex(ships)
+        self.ships_set = set(block for ship in ships for block in ship)
+
+
+class GameState:
+    """State of one match: both players' fleets, misses and hits.
+
+    Nothing here touches the module globals, so any number of matches can be played
+    in one interpreter. Blocks of player2's grid are shifted along x, by 15 on the classic
+    board, as on screen.
+
+    :param player1_ships: player1's ships (on the left grid)
+    :type player1_ships: list[list]
+    :param player2_ships: player2's ships (on the right grid, x offset config.player2_offset)
+    :type player2_ships: list[list]
+    :param config: size of the grids. Defaults to CLASSIC
+    :type config: BoardConfig
+    :param dotted_set: missed blocks and blocks around hit ones on both grids
+    :type dotted_set: set
+    :param hit_blocks: blocks that were hit on both grids
+    :type hit_blocks: set
+    :param player2_turn: turn of player2 or player1
+    :type player2_turn: bool
+    """
+    def __init__(self, player1_ships=None, player2_ships=None, config=CLASSIC):
+        self.config = config
+        self.player1 = Fleet(player1_ships or [])
+        self.player2 = Fleet(player2_ships or [])
+        self.dotted_set = set()
+        self.hit_blocks = set()
+        self.player2_turn = False
+
+    def is_valid_shot(self, fired_block):
+        """Checks that the block is on the opponent's grid and has not been shot at yet
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :rtype: bool
+        """
+        offset = 0 if self.player2_turn else self.config.player2_offset
+        return (self.config.on_grid(fired_block, offset) and
+                fired_block not in self.dotted_set and fired_block not in self.hit_blocks)
+
+    def fire(self, fired_block):
+        """Fires at the opponent of the player whose turn it is
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :return: MISS, HIT or SUNK
+        :rtype: str
+        :raises Warning: if the block is not on the opponent's grid or was already shot at
+        """
+        if not self.is_valid_shot(fired_block):
+            raise Warning(f"invalid shot {fired_block}")
+        opponent = self.player1 if self.player2_turn else self.player2
+        ind = opponent.index.ship_of.get(fired_block)
+        self.player2_turn = check_hit_or_miss(fired_block, opponent.index, self.player2_turn,
+                                              opponent.ships, opponent.ships_set, self)
+        if ind is None:
+            return MISS
+        return HIT if opponent.index.decks_left[ind] else SUNK
+
+    @property
+    def winner(self):
+        """1 or 2 when all ships of the other player are destroyed, otherwise None"""
+        if not self.player2.ships_set and self.player2.ships:
+            return 1
+        if not self.player1.ships_set and self.player1.ships:
+            return 2
+        return None
+
+
+# Compatibility shim: the rule functions below used to work on the module globals
+# dotted_set and hit_blocks. They still do when no state is given, so old callers keep
+# working; everything new passes a GameState instead.
+_legacy_state = GameState()
+dotted_set = _legacy_state.dotted_set
+hit_blocks = _legacy_state.hit_blocks
+
+
+def check_hit_or_miss(fired_block, opponents_ships_list, player2_turn, opponents_ships_list_original_copy,
+                      opponents_ships_set, state=None):
+    """Checks whether the block that was shot at either by computer or by human is a hit or a miss.
+
+    :param fired_block: fired_block
+    :type fired_block: tuple[int, int]
+    :param opponents_ships_list: opponents_ships_list, the opponent's FleetIndex, or the opponent's
+        bitboard.BitBoard, which keeps its own misses and hits (the other arguments are then not used)
+    :type opponents_ships_list: list[list] | FleetIndex | BitBoard
+    :param player2_turn: turn of player2 or  player1
+    :type player2_turn: bool
+    :param opponents_ships_list_original_copy: opponents_ships_list_original_copy
+    :type opponents_ships_list_original_copy: list[list]
+    :param opponents_ships_set: opponents_ships_set
+    :type opponents_ships_set: set[list]
+    :param state: match to update. Defaults to None (the legacy module-level dotted_set and hit_blocks)
+    :type state: GameState
+    :returns: True or False
+    :rtype: bool
+    """
+    if isinstance(opponents_ships_list, FleetIndex):
+        result, ind = opponents_ships_list.fire(fired_block)
+        if result == MISS:
+            add_missed_block_to_dotted_set(fired_block, state)
+            return not player2_turn
+        update_dotted_and_hit_sets(fired_block, player2_turn, result == HIT, state)
+        opponents_ships_set.discard(fired_block)
+        if result == SUNK:
+            update_destroyed_ships(ind, player2_turn, opponents_ships_list_original_copy, state)
+        return player2_turn
+    if not isinstance(opponents_ships_list, list):
+        return opponents_ships_list.check_hit_or_miss(fired_block, player2_turn)
+    for elem in opponents_ships_list:
+        diagonal_only = True
+        if fired_block in elem:
+            ind = opponents_ships_list.index(elem)
+            if len(elem) == 1:
+                diagonal_only = False
+            update_dotted_and_hit_sets(
+                fired_block, player2_turn, diagonal_only, state)
+            elem.remove(fired_block)
+            opponents_ships_set.discard(fired_block)
+            if not elem:
+                update_destroyed_ships(
+                    ind, player2_turn, opponents_ships_list_original_copy, state)
+            if not player2_turn:
+                return False
+            else:
+                return True
+    add_missed_block_to_dotted_set(fired_block, state)
+    if player2_turn:
+        return False
+    else:
+        return True
+
+
+def add_missed_block_to_dotted_set(fired_block, state=None):
+    """Adds a fired_block to the set of missed shots
+
+    :param fired_block: fired_block
+    :type fired_block: tuple[int, int]
+    :param state: match to update. Defaults to None (the legacy module-level dotted_set)
+    :type state: GameState
+    """
+    if not isinstance(fired_block, tuple):
+        raise Warning
+    if state is None:
+        state = _legacy_state
+    state.dotted_set.add(fired_block)
+
+
+def update_destroyed_ships(ind, player2_turn, opponents_ships_list_original_copy, state=None):
+    """Adds blocks before and after a ship to dotted_set to draw dots on them.
+
+    :param ind: index
+    :type ind: int
+    :param player2_turn: turn of player2 or  player1
+    :type player2_turn: bool
+    :param opponents_ships_list_original_copy: opponents_ships_list_original_copy
+    :type opponents_ships_list_original_copy: list[list]
+    :param state: match to update. Defaults to None (the legacy module-level dotted_set and hit_blocks)
+    :type state: GameState
+    """
+    if not isinstance(opponents_ships_list_original_copy, list):
+        raise Warning
+    ship = sorted(opponents_ships_list_original_copy[ind])
+    for i in range(-1, 1):
+        update_dotted_and_hit_sets(ship[i], player2_turn, False, state)
+
+
+def update_dotted_and_hit_sets(fired_block, player2_turn, diagonal_only=True, state=None):
+    """ Puts dots in center of diagonal or all around a block that was hit
+
+    :param fired_block: fired_block
+    :type fired_block: tuple[int, int]
+    :param player2_turn: turn of player2 or  player1
+    :type player2_turn: bool
+    :param diagonal_only: only diagonal or all blocks
+    :type diagonal_only: bool
+    :param state: match to update. Defaults to None (the legacy module-level dotted_set and hit_blocks)
+    :type state: GameState
+    """
+    if state is None:
+        state = _legacy_state
+    x, y = fired_block
+    a = 0 if player2_turn else state.config.player2_offset
+    b = a + state.config.width + 1
+    height = state.config.height
+    state.hit_blocks.add((x, y))
+    for i in range(-1, 2):
+        for j in range(-1, 2):
+            if diagonal_only:
+                if i != 0 and j != 0 and a < x + i < b and 0 < y + j <= height:
+                    state.dotted_set.add((x + i, y + j))
+            else:
+                if a < x + i < b and 0 < y + j <= height:
+                    state.dotted_set.add((x + i, y + j))
+    state.dotted_set -= state.hit_blocks
+
+
+def ship_is_valid(ship_set, blocks_for_manual_drawing):
+    """Checks if ship is not touching other ships
+
+   :param ship_set: ship_set, or a bitboard mask
+   :type ship_set: set | int
+   :param blocks_for_manual_drawing: blocks_for_manual_drawing, or a bitboard mask
+   :type blocks_for_manual_drawing: set | int
+   :return: ship_set.isdisjoint(blocks_for_manual_drawing)
+   :rtype:bool
+    """
+    if isinstance(ship_set, int):
+        if ship_set.bit_count() > 4:
+            raise Warning
+        return not ship_set & blocks_for_manual_drawing
+    if len(ship_set) > 4:
+        raise Warning
+    return ship_set.isdisjoint(blocks_for_manual_drawing)
+
+
+def check_ships_numbers(ship, num_ship_list):
+    """Checks if a ship of particular length (1-4) does not exceed necessary quantity (4-1)
+
+   :param ship: List with new ships' coordinates
+   :type ship: list
+   :param num_ship_list: List_with numbers of particular ships on respective indexes.
+   :type num_ship_list: list
+   :return: (5 - len(ship)) > num_ship_list[len(ship) - 1]
+   :rtype: bool
+    """
+    if num_ship_list[-1] > 1 or num_ship_list[-2] > 2 or num_ship_list[-3] > 3 or num_ship_list[-4] > 4:
+        raise Warning
+    return (5 - len(ship)) > num_ship_list[len(ship) - 1]
+
+
+def update_used_blocks(ship, used_blocks_set):
+    """Adds blocks for drawing
+
+    :param ship: ship
+    :type ship: set
+    :param used_blocks_set: used_blocks_set
+    :type used_blocks_set: set
+    :return: used_blocks_set: used_blocks_set
+    :rtype: set
+    """
+    if len(ship) > 5:
+        raise Warning
+    for block in ship:
+        for i in range(-1, 2):
+            for j in range(-1, 2):
+                used_blocks_set.add((block[0] + i, block[1] + j))
+    return used_blocks_set
+
+
+def restore_used_blocks(deleted_ship, used_blocks_set):
+    """Discard blocks for drawing
+
+    :param deleted_ship: deleted ship
+    :type deleted_ship: list
+    :param used_blocks_set: used_blocks_set
+    :type used_blocks_set: set
+    :return: used_blocks_set: used_blocks_set
+    :rtype: set
+    """
+    if isinstance(used_blocks_set, list):
+        raise Warning
+    for block in deleted_ship:
+        for i in range(-1, 2):
+            for j in range(-1, 2):
+                used_blocks_set.discard((block[0] + i, block[1] + j))
+    return used_blocks_set
+
+
+def ship_halo(ship):
+    """Blocks of a ship and the blocks around it
+
+    :param ship: ship
+    :type ship: list[tuple[int, int]]
+    :rtype: set[tuple[int, int]]
+    """
+    return {(block[0] + i, block[1] + j) for block in ship for i in range(-1, 2) for j in range(-1, 2)}
+
+
+class OccupancyGrid:
+    """Blocks taken by placed ships and their surroundings, counted per ship
+
+    Every placed ship adds one to each block of its halo and removing it takes that one
+    away again, so a block next to two ships stays taken until both are removed.
+
+    :param counts: block -> number of placed ships whose halo covers it
+    :type counts: dict[tuple[int, int], int]
+    """
+    def __init__(self):
+        self.counts = {}
+
+    def __contains__(self, block):
+        return block in self.counts
+
+    def is_free(self, ship):
+        """Checks if a ship can be placed without touching the placed ships
+
+        :param ship: ship
+        :type ship: list[tuple[int, int]] | set[tuple[int, int]]
+        :rtype: bool
+        """
+        counts = self.counts
+        return not any(block in counts for block in ship)
+
+    def add(self, ship):
+        counts = self.counts
+        for block in ship_halo(ship):
+            counts[block] = counts.get(block, 0) + 1
+
+    def remove(self, ship):
+        """Takes a placed ship away
+
+        :param ship: ship
+        :type ship: list[tuple[int, int]]
+        :raises Warning: if the ship was not added
+        """
+        counts = self.counts
+        halo = ship_halo(ship)
+        if any(block not in counts for block in halo):
+            raise Warning(f"ship {ship} is not on the grid")
+        for block in halo:
+            if counts[block] == 1:
+                del counts[block]
+            else:
+                counts[block] -= 1
+
+
+class PlacementHistory:
+    """Ships placed by hand, with undo and redo of the placements
+
+    Placing, undoing and redoing only touch the blocks of one ship and its halo. Once more
+    than limit placements were made the oldest ones can no longer be undone.
+
+    :param ships: placed ships, in order; changed in place
+    :type ships: list[list]
+    :param ships_set: blocks of the placed ships; changed in place
+    :type ships_set: set
+    :param num_ships_list: number of placed ships of every length, like check_ships_numbers
+        takes it; changed in place
+    :type num_ships_list: list[int]
+    :param occupancy: blocks taken by the placed ships
+    :type occupancy: OccupancyGrid
+    :param limit: number of placements that can be undone
+    :type limit: int
+    """
+    def __init__(self, ships=None, ships_set=None, num_ships_list=None, occupancy=None, limit=100):
+        self.ships = ships if ships is not None else []
+        self.ships_set = ships_set if ships_set is not None else set()
+        self.num_ships_list = num_ships_list if num_ships_list is not None else [0] * max(FLEET)
+        self.occupancy = occupancy if occupancy is not None else OccupancyGrid()
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    def place(self, ship):
+        """Places a ship and forgets the placements that could be redone
+
+        :param ship: ship
+        :type ship: list[tuple[int, int]]
+        :raises Warning: if the ship touches a placed ship
+        """
+        if not self.occupancy.is_free(ship):
+            raise Warning(f"ship {ship} touches another ship")
+        self._add(ship)
+        self.undo_stack.append(ship)
+        self.redo_stack.clear()
+
+    def undo(self):
+        """Takes back the last placement
+
+        :return: the ship taken away, or None if there is nothing to undo
+        :rtype: list[tuple[int, int]] | None
+        """
+        if not self.undo_stack:
+            return None
+        ship = self.undo_stack.pop()
+        # placements are undone in reverse order, so the ship is always the last one
+        self.ships.pop()
+        self.ships_set.difference_update(ship)
+        self.num_ships_list[len(ship) - 1] -= 1
+        self.occupancy.remove(ship)
+        self.redo_stack.append(ship)
+        return ship
+
+    def redo(self):
+        """Places the last ship taken back by undo again
+
+        :return: the ship placed, or None if there is nothing to redo
+        :rtype: list[tuple[int, int]] | None
+        """
+        if not self.redo_stack:
+            return None
+        ship = self.redo_stack.pop()
+        self._add(ship)
+        self.undo_stack.append(ship)
+        return ship
+
+    def _add(self, ship):
+        self.ships.append(ship)
+        self.ships_set.update(ship)
+        self.num_ships_list[len(ship) - 1] += 1
+        self.occupancy.add(ship)
+
+
+# one token of a fleet file: "[", "]", "(x, y)" or ",", with any whitespace in front
+_SHIPS_TOKEN = re.compile(r'\s*(?:(\[)|(\])|\(\s*(\d+)\s*,\s*(\d+)\s*\)|,)')
+
+
+def parse_ships(text):
+    """Reads ships written as a list of lists of (x, y) tuples, without eval
+
+    :param text: text like "[[(1, 1), (2, 1)], [(5, 5)]]"
+    :type text: str
+    :return: ships
+    :rtype: list[list[tuple[int, int]]]
+    :raises Warning: if the text is not a list of lists of blocks
+    """
+    text = text.strip()
+    ships = []
+    ship = None
+    depth = 0
+    pos = 0
+    while pos < len(text):
+        match = _SHIPS_TOKEN.match(text, pos)
+        if not match or (depth == 0 and pos and match.group(0).strip()):
+            raise Warning(f"unexpected {text[pos:pos + 10]!r} at position {pos}")
+        pos = match.end()
+        opening, closing, x, y = match.groups()
+        if opening:
+            depth += 1
+            if depth > 2:
+                raise Warning(f"too many brackets at position {match.start()}")
+            ship = []
+        elif closing:
+            if depth == 0:
+                raise Warning(f"unmatched ']' at position {match.start()}")
+            if depth == 2:
+                ships.append(ship)
+            depth -= 1
+        elif x is not None:
+            if depth != 2:
+                raise Warning(f"block outside of a ship at position {match.start()}")
+            ship.append((int(x), int(y)))
+    if depth:
+        raise Warning("unclosed '['")
+    return ships
+
+
+def fleet_is_valid(ships, offset=0, config=CLASSIC):
+    """Checks that the ships are the whole fleet, are straight, lie on the grid and do not touch
+
+    :param ships: ships
+    :type ships: list[list[tuple[int, int]]]
+    :param offset: where the grid starts
+    :type offset: int
+    :param config: size of the grid and the fleet. Defaults to CLASSIC
+    :type config: BoardConfig
+    :rtype: bool
+    """
+    if sorted(len(ship) for ship in ships) != sorted(config.fleet):
+        return False
+    ship_of = {}
+    for ind, ship in enumerate(ships):
+        xs = sorted(block[0] for block in ship)
+        ys = sorted(block[1] for block in ship)
+        if not (config.on_grid((xs[0], ys[0]), offset) and config.on_grid((xs[-1], ys[-1]), offset)):
+            return False
+        if not ((xs[0] == xs[-1] and ys == list(range(ys[0], ys[0] + len(ship)))) or
+                (ys[0] == ys[-1] and xs == list(range(xs[0], xs[0] + len(ship))))):
+            return False
+        for block in ship:
+            ship_of[block] = ind
+    for ind, ship in enumerate(ships):
+        for x, y in ship:
+            for i in range(-1, 2):
+                for j in range(-1, 2):
+                    if ship_of.get((x + i, y + j), ind) != ind:
+                        return False
+    return True
+
+
+def files_ships_function(file):
+    """A function for opening a file and creating ships based on data from the file
+
+    The file is read in one pass without eval, and the ships must be a valid fleet on the
+    left grid or on the right one (x offset 15).
+
+    :param file: file
+    :type file: str
+    :return: [files_ships_list, files_ships_set]
+    :rtype: list
+    :raises Warning: if the file does not hold a valid fleet
+    """
+    if not isinstance(file, str):
+        raise Warning
+    with open(file) as f:
+        files_ships_list = parse_ships(f.read())
+    offset = 15 if any(block[0] > 10 for ship in files_ships_list for block in ship) else 0
+    if not fleet_is_valid(files_ships_list, offset):
+        raise Warning(f"{file} does not hold a valid fleet")
+    files_ships_set = set(block for ship in files_ships_list for block in ship)
+    return [files_ships_list, files_ships_set]
@@ -0,0 +1,77 @@
+"""Batch fleet generation with NumPy.
+
+All N boards place their i-th ship at once: the legal placements of every board are found
+with one matrix product against the placement table, and one random legal placement per
+board is picked with an argmax over random keys. A board that runs out of room is drawn
+again from scratch together with the other failed boards.
+"""
+import numpy as np
+
+from morskoy_boy.engine import FLEET
+from morskoy_boy.bitboard import WIDTH, HEIGHT, iter_cells, cell_to_block
+from morskoy_boy.placement import default_table
+
+
+def _placement_arrays(table, length):
+    ships = np.zeros((len(table.placements[length]), WIDTH * HEIGHT), dtype=np.float32)
+    halos = np.zeros_like(ships, dtype=bool)
+    for ind, (ship_mask, ship_halo) in enumerate(table.placements[length]):
+        ships[ind, list(iter_cells(ship_mask))] = 1
+        halos[ind, list(iter_cells(ship_halo))] = True
+    return ships, halos
+
+
+def generate_fleets(n, seed=None, fleet=FLEET, table=default_table, chunk_size=65536):
+    """Generates n random fleets
+
+    :param n: number of fleets
+    :type n: int
+    :param seed: seed or numpy Generator. Defaults to None (fresh entropy)
+    :type seed: int | np.random.Generator
+    :param fleet: lengths of ships, in order
+    :type fleet: tuple[int]
+    :param table: placements to draw from
+    :type table: PlacementTable
+    :param chunk_size: boards generated together, bounds the memory used
+    :type chunk_size: int
+    :return: occupancy grids of shape (n, 10, 10) and ship indexes into fleet of the same
+        shape (-1 for water), both indexed as [fleet, y - 1, x - 1]
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    rng = np.random.default_rng(seed)
+    arrays = {length: _placement_arrays(table, length) for length in set(fleet)}
+    ship_ids = np.full((n, WIDTH * HEIGHT), -1, dtype=np.int8)
+    todo = np.arange(n)
+    while len(todo):
+        chunk, todo = todo[:chunk_size], todo[chunk_size:]
+        blocked = np.zeros((len(chunk), WIDTH * HEIGHT), dtype=np.float32)
+        ids = np.full((len(chunk), WIDTH * HEIGHT), -1, dtype=np.int8)
+        failed = np.zeros(len(chunk), dtype=bool)
+        for ship_id, length in enumerate(fleet):
+            ships, halos = arrays[length]
+            legal = (blocked @ ships.T) == 0
+            keys = np.where(legal, rng.random(legal.shape), -1.0)
+            choice = keys.argmax(axis=1)
+            failed |= ~legal[np.arange(len(chunk)), choice]
+            blocked[halos[choice]] = 1
+            ids[ships[choice] > 0] = ship_id
+        ship_ids[chunk[~failed]] = ids[~failed]
+        todo = np.concatenate((todo, chunk[failed]))
+    ship_ids = ship_ids.reshape(n, HEIGHT, WIDTH)
+    return (ship_ids >= 0).astype(np.uint8), ship_ids
+
+
+def fleet_to_ships(ship_ids, offset=0):
+    """Turns one fleet's ship indexes back into AutoShips-style ships
+
+    :param ship_ids: ship indexes of shape (10, 10), -1 for water
+    :type ship_ids: np.ndarray
+    :param offset: where the grid starts
+    :type offset: int
+    :return: [ships, ships_set]
+    :rtype: list
+    """
+    flat = np.asarray(ship_ids).reshape(-1)
+    ships = [[cell_to_block(int(cell), offset) for cell in np.flatnonzero(flat == ship_id)]
+             for ship_id in range(int(flat.max()) + 1)]
+    return [ships, set(block for ship in ships for block in ship)]
@@ -0,0 +1,737 @@
+import functools
+import sys
+import time
+
+import pygame
+
+from morskoy_boy import engine
+from morskoy_boy.instrument import NULL_PROFILER
+from morskoy_boy.placement import TableShips
+from morskoy_boy.matchlog import replay_steps
+from morskoy_boy.engine import (CLASSIC, column_name, GameState, OccupancyGrid, PlacementHistory, check_ships_numbers,
+                                files_ships_function)
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREEN_BLUE = (0, 153, 153)
+LIGHT_GRAY = (192, 192, 192)
+RED = (255, 0, 0)
+
+block_size = 30
+left_margin = 2 * block_size
+upper_margin = block_size
+
+size = (left_margin + 30 * block_size, upper_margin + 15 * block_size)
+LETTERS = [column_name(column) for column in range(CLASSIC.width)]
+pygame.init()
+
+screen = pygame.display.set_mode(size)
+pygame.display.set_caption("Morskoy Boy")
+
+font_size = int(block_size / 1.5)
+
+font = pygame.font.SysFont('notosans', font_size)
+TEXT_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(text, color=BLACK, which_font=font):
+    """Renders text once and returns the same surface for the same (text, color, font) afterwards
+
+    :param text: text
+    :type text: str
+    :param color: Color of the text. Defaults to BLACK.
+    :type color: tuple
+    :param which_font: What font to use. Defaults to font.
+    :rtype: Surface
+    """
+    return which_font.render(text, True, color)
+
+
+class Button:
+    """Class creates buttons and prints explanatory message for them
+
+    :param x_offset: horizontal offset where to start drawing button
+    :type x_offset: int
+    :param button_title: Button's name
+    :type button_title: str
+    :param title_width: width of title
+    :type title_width: int
+    :param title_height: height pf title
+    :type title_height: int
+    :param message_to_show: explanatory message to print onscreen
+    :type message_to_show: str
+    :param color: Button's color. Defaults to None (BLACK)
+    :type color: tuple
+    :param mouse: pose of mouse
+    :type mouse: tuple[int, int]
+    :param x_start: where the button starts
+    :type x_start: int
+    :param y_start: where the button starts
+    :type y_start: int
+    :param rect_for_draw: rectangle coordinates
+    :type rect_for_draw: tuple[int, int, int, int]
+    :param rect: rect
+    :type rect: Rect
+    :param rect_for_draw_button_title: place of button title
+    :type rect_for_draw_button_title: tuple[float, float]
+    """
+    def __init__(self, x_offset, button_title, message_to_show):
+        self.title = button_title
+        self.title_width, self.title_height = render_text(self.title, WHITE).get_size()
+        self.message = message_to_show
+        self.button_width = self.title_width + block_size
+        self.button_height = self.title_height + block_size
+        self.x_start = x_offset
+        self.y_start = upper_margin + 10 * block_size + self.button_height
+        self.rect_for_draw = self.x_start, self.y_start, self.button_width, self.button_height
+
+        self.rect = pygame.Rect(self.rect_for_draw)
+
+        self.rect_for_draw_button_title = (self.x_start + self.button_width / 2 - self.title_width / 2,
+                                           self.y_start + self.button_height / 2 - self.title_height / 2)
+        self.color = BLACK
+
+    def draw_button(self, color=None):
+        if not color:
+            color = self.color
+        pygame.draw.rect(screen, color, self.rect_for_draw)
+        text_to_blit = render_text(self.title, WHITE)
+        screen.blit(text_to_blit, self.rect_for_draw_button_title)
+
+    def change_color_on_hover(self):
+        mouse = pygame.mouse.get_pos()
+        if self.rect.collidepoint(mouse):
+            self.draw_button(GREEN_BLUE)
+
+    def print_message_for_button(self):
+        if self.message:
+            text = render_text(self.message)
+            message_width, message_height = text.get_size()
+            rect_for_message = (self.x_start / 2 - message_width / 2,
+                                self.y_start + self.button_height / 2 - message_height / 2)
+            screen.blit(text, rect_for_message)
+
+
+auto_button_place = left_margin + 17 * block_size
+manual_button_place = left_margin + 20 * block_size
+files_button_place = left_margin + 24.5 * block_size
+how_to_create_ships_message = "Как вы хотите создать корабли?(АВТО через 1.5мин)"
+auto_button = Button(auto_button_place, "АВТО", how_to_create_ships_message)
+manual_button = Button(manual_button_place, "ВРУЧНУЮ", how_to_create_ships_message)
+files_button = Button(files_button_place, "ФАЙЛЫ", how_to_create_ships_message)
+undo_message = "Отменить или вернуть корабль (Ctrl+Z, Ctrl+Y)"
+undo_button_place = left_margin + 14 * block_size
+undo_button = Button(undo_button_place, "ОТМЕНА", undo_message)
+redo_button = Button(undo_button.rect_for_draw[0] + undo_button.rect_for_draw[2], "ВЕРНУТЬ", None)
+message_rect_for_drawing_ships = (redo_button.rect_for_draw[0] + redo_button.rect_for_draw[2],
+                                  upper_margin + 11 * block_size,
+                                  size[0] - (redo_button.rect_for_draw[0] + redo_button.rect_for_draw[2]),
+                                  4 * block_size)
+player1_ships_to_draw = []
+player2_ships_to_draw = []
+
+
+def draw_ships(ships_coordinates_list):
+    """Draws rectangles around the blocks that are occupied by a ship
+
+    :param x_start: where the ship starts
+    :type x_start: int
+    :param y_start: where the ship starts
+    :type y_start: int
+    :param ships_coordinates_list:  a list of ships s coordinates
+    :type ships_coordinates_list: list[list]
+    """
+    for elem in ships_coordinates_list:
+        ship = sorted(elem)
+        x_start = ship[0][0]
+        y_start = ship[0][1]
+        # Hor and 1block ships
+        ship_width = block_size * len(ship)
+        ship_height = block_size
+        # Vert ships
+        if len(ship) > 1 and ship[0][0] == ship[1][0]:
+            ship_width, ship_height = ship_height, ship_width
+        x = block_size * (x_start - 1) + left_margin
+        y = block_size * (y_start - 1) + upper_margin
+        pygame.draw.rect(
+            screen, BLACK, ((x, y), (ship_width, ship_height)), width=block_size // 10)
+
+
+class Grid:
+    """Class to draw the grids and add title, numbers and letters to them
+
+    :param title: Players' name to be displayed on the top of his grid
+    :type title: str
+    :param offset:  Where the grid starts (in number of blocks)
+    :type offset: int
+    :param surface: Where to draw the grid. Defaults to None (screen)
+    :type surface: Surface
+    """
+    def __init__(self, title, offset, surface=None):
+        self.title = title
+        self.offset = offset
+        self.surface = surface or screen
+        self.draw_grid()
+        self.add_nums_letters_to_grid()
+        self.sign_grids()
+
+    def draw_grid(self):
+        for i in range(11):
+            # Hor grid
+            pygame.draw.line(self.surface, BLACK, (left_margin + self.offset, upper_margin + i * block_size),
+                             (left_margin + 10 * block_size + self.offset, upper_margin + i * block_size), 1)
+            # Vert grid
+            pygame.draw.line(self.surface, BLACK, (left_margin + i * block_size + self.offset, upper_margin),
+                             (left_margin + i * block_size + self.offset, upper_margin + 10 * block_size), 1)
+
+    def add_nums_letters_to_grid(self):
+        for i in range(10):
+            num_ver = render_text(str(i + 1))
+            letters_hor = render_text(LETTERS[i])
+            num_ver_width = num_ver.get_width()
+            num_ver_height = num_ver.get_height()
+            letters_hor_width = letters_hor.get_width()
+
+            # Ver num grid1
+            self.surface.blit(num_ver, (left_margin - (block_size // 2 + num_ver_width // 2) + self.offset,
+                                  upper_margin + i * block_size + (block_size // 2 - num_ver_height // 2)))
+            # Hor LETTERS grid1
+            self.surface.blit(letters_hor, (left_margin + i * block_size + (block_size //
+                                                                      2 - letters_hor_width // 2) + self.offset,
+                                      upper_margin - block_size))
+
+    def sign_grids(self):
+        player = render_text(self.title)
+        sign_width = player.get_width()
+        self.surface.blit(player, (left_margin + 5 * block_size - sign_width // 2 + self.offset,
+                             upper_margin - block_size // 2 - font_size + 11 * block_size))
+
+
+@functools.lru_cache(maxsize=2)
+def grids_background(grids_block_size):
+    """Draws both grids with their letters, numbers and titles once into an offscreen surface
+
+    :param grids_block_size: block_size the surface is drawn for, a new one is drawn when it changes
+    :type grids_block_size: int
+    :rtype: Surface
+    """
+    background = pygame.Surface(size)
+    background.fill(WHITE)
+    Grid("PLAYER1", 0, background)
+    Grid("PLAYER2", 15 * grids_block_size, background)
+    return background
+
+
+def draw_grids(rect=None):
+    """Blits the pre-rendered grids to the screen
+
+    :param rect: part of the screen to restore. Defaults to None (whole screen)
+    :type rect: tuple[int, int, int, int]
+    """
+    rect = pygame.Rect(rect or (0, 0, size[0], size[1]))
+    screen.blit(grids_background(block_size), rect, rect)
+
+
+def draw_from_dotted_set(dotted_set):
+    """Draws dots in the center of all blocks in the dotted_set
+
+    :param dotted_set: dotted_set
+    :type dotted_set: set
+    """
+    for elem in dotted_set:
+        pygame.draw.circle(screen, BLACK, (block_size * (
+                elem[0] - 0.5) + left_margin, block_size * (elem[1] - 0.5) + upper_margin), block_size // 6)
+
+
+def draw_hit_blocks(hit_blocks):
+    """ Draws 'X' in the blocks that were successfully hit either by computer or by human
+
+    :param hit_blocks: hit blocks
+    :type hit_blocks: set
+    """
+    for block in hit_blocks:
+        x1 = block_size * (block[0] - 1) + left_margin
+        y1 = block_size * (block[1] - 1) + upper_margin
+        pygame.draw.line(screen, BLACK, (x1, y1),
+                         (x1 + block_size, y1 + block_size), block_size // 6)
+        pygame.draw.line(screen, BLACK, (x1, y1 + block_size),
+                         (x1 + block_size, y1), block_size // 6)
+
+
+def block_rect(block):
+    """Returns the screen rect of a block, with room for the thick lines of an 'X'
+
+    :param block: block
+    :type block: tuple[int, int]
+    :rtype: Rect
+    """
+    rect = pygame.Rect(block_size * (block[0] - 1) + left_margin, block_size * (block[1] - 1) + upper_margin,
+                       block_size, block_size)
+    return rect.inflate(block_size // 6, block_size // 6)
+
+
+class Renderer:
+    """Draws only what changed since the last frame and caps the frame rate
+
+    Dots and 'X's that are already on the screen are not drawn again, only the rects of
+    new ones are passed to pygame.display.update, and a frame with nothing new does not
+    touch the display at all.
+
+    :param fps: maximum frames per second
+    :type fps: int
+    :param clock: clock that limits the frame rate
+    :type clock: pygame.time.Clock
+    :param drawn_dots: dots that are on the screen
+    :type drawn_dots: set
+    :param drawn_hits: 'X's that are on the screen
+    :type drawn_hits: set
+    :param dirty_rects: parts of the screen changed since the last flush
+    :type dirty_rects: list[Rect]
+    """
+    def __init__(self, fps=30):
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.drawn_dots = set()
+        self.drawn_hits = set()
+        self.dirty_rects = [screen.get_rect()]
+
+    def draw_marks(self, dotted_set, hit_blocks):
+        """Draws dots and 'X's that are not on the screen yet
+
+        :param dotted_set: dotted_set
+        :type dotted_set: set
+        :param hit_blocks: hit blocks
+        :type hit_blocks: set
+        """
+        new_dots = dotted_set - self.drawn_dots
+        new_hits = hit_blocks - self.drawn_hits
+        draw_from_dotted_set(new_dots)
+        draw_hit_blocks(new_hits)
+        self.drawn_dots |= new_dots
+        self.drawn_hits |= new_hits
+        self.dirty_rects.extend(block_rect(block) for block in new_dots | new_hits)
+
+    def add_dirty_rect(self, rect):
+        """Marks a part of the screen that was drawn on outside of the renderer
+
+        :param rect: rectangle in (x_start, y_start, width, height) format
+        :type rect: tuple | Rect
+        """
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def show(self):
+        """Shows the changed parts of the screen
+
+        :return: whether anything was shown
+        :rtype: bool
+        """
+        updated = bool(self.dirty_rects)
+        if updated:
+            pygame.display.update(self.dirty_rects)
+            self.dirty_rects = []
+        return updated
+
+    def flush(self):
+        """Shows the changed parts of the screen and waits for the next frame
+
+        :return: whether anything was shown
+        :rtype: bool
+        """
+        updated = self.show()
+        self.clock.tick(self.fps)
+        return updated
+
+
+# the profiler overlay is redrawn every this many frames
+OVERLAY_FRAMES = 10
+ENGINE_FUNCTIONS = ('check_hit_or_miss', 'add_missed_block_to_dotted_set', 'update_destroyed_ships',
+                    'update_dotted_and_hit_sets')
+GAME_ENGINE_FUNCTIONS = ('check_ships_numbers', 'files_ships_function')
+
+
+def instrument_game(profiler):
+    """Makes the profiler time the drawing functions and display updates and count engine calls
+
+    Call profiler.unpatch() to undo it.
+
+    :param profiler: profiler
+    :type profiler: Profiler
+    """
+    game = sys.modules[__name__]
+    profiler.patch(game, ['draw_from_dotted_set', 'draw_hit_blocks', 'draw_grids', 'Grid', 'render_text'])
+    profiler.patch(pygame.display, ['update'], prefix='display.')
+    profiler.patch(engine, ENGINE_FUNCTIONS, timed=False)
+    profiler.patch(engine.FleetIndex, ['fire'], timed=False, prefix='FleetIndex.')
+    profiler.patch(engine.PlacementHistory, ['place', 'undo', 'redo'], timed=False, prefix='PlacementHistory.')
+    profiler.patch(game, GAME_ENGINE_FUNCTIONS, timed=False)
+
+
+def draw_profiler_overlay(profiler, renderer):
+    """Writes the profiler's overlay line at the bottom of the screen
+
+    :param profiler: profiler
+    :type profiler: Profiler
+    :param renderer: renderer that shows the line
+    :type renderer: Renderer
+    """
+    rect = (0, size[1] - block_size, size[0], block_size)
+    screen.fill(WHITE, rect)
+    # not render_text: the numbers change every time and would only churn its cache
+    text = font.render(profiler.overlay_text(), True, GREEN_BLUE)
+    screen.blit(text, (block_size // 3, size[1] - block_size + (block_size - text.get_height()) // 2))
+    renderer.add_dirty_rect(rect)
+
+
+def show_message_at_rect_center(text, rect, which_font=font, color=RED):
+    """Prints message to screen at a given rect's center.
+
+   :param text: Message to print
+   :type text: str
+   :param rect: rectangle in (x_start, y_start, width, height) format
+   :type rect: tuple
+   :param which_font: What font to use to print message. Defaults to font.
+   :param color: Color of the message. Defaults to RED.
+   :type color: tuple
+    """
+    text_to_blit = render_text(text, color, which_font)
+    text_width, text_height = text_to_blit.get_size()
+    text_rect = pygame.Rect(rect)
+    x_start = text_rect.centerx - text_width / 2
+    y_start = text_rect.centery - text_height / 2
+    screen.blit(text_to_blit, (x_start, y_start))
+
+
+def manual_ships(offset, drawing, ships_not_created, rect_for_grids, num_ships_list, player_ships_set,
+                 rect_for_messages_and_buttons, start, ship_size, occupancy, player_ships_to_draw):
+    """Allows both players to create ships manually
+
+    :param offset: Where the grid starts (in number of blocks)
+    :type offset: int
+    :param drawing: Shows when the drawing of the ship begins
+    :type drawing: bool
+    :param ships_not_created: shows whether ships have been created or not
+    :type ships_not_created: bool
+    :param rect_for_grids: rect_for_grids
+    :type rect_for_grids: tuple[int, int, int, int]
+    :param num_ships_list: list with the number of ship lengths and their number
+    :type num_ships_list: list[int]
+    :param player_ships_set: Lots of ships
+    :type player_ships_set: set
+    :param rect_for_messages_and_buttons: rect for messages and buttons
+    :type rect_for_messages_and_buttons: tuple[int, int, int, int]
+    :param start: the beginning of the construction of ship
+    :type start: tuple[int, int]
+    :param ship_size: ship size
+    :type ship_size: tuple[int, int]
+    :param occupancy: blocks on which no ship may be drawn
+    :type occupancy: OccupancyGrid
+    :param player_ships_to_draw: player's ships, new ships are appended to it
+    :type player_ships_to_draw: list
+    """
+    history = PlacementHistory(player_ships_to_draw, player_ships_set, num_ships_list, occupancy)
+    while ships_not_created:
+        draw_grids(rect_for_grids)
+        undo_button.draw_button()
+        undo_button.print_message_for_button()
+        undo_button.change_color_on_hover()
+        if not history.can_undo():
+            undo_button.draw_button(LIGHT_GRAY)
+        redo_button.draw_button()
+        redo_button.change_color_on_hover()
+        if not history.can_redo():
+            redo_button.draw_button(LIGHT_GRAY)
+        pygame.draw.rect(screen, BLACK, (start, ship_size), 3)
+        pygame.display.update()
+        events = wait_for_events()
+        mouse = pygame.mouse.get_pos()
+        for event in events:
+            if event.type == pygame.QUIT:
+                ships_not_created = False
+                game_over = True
+            elif (undo_button.rect.collidepoint(mouse) and event.type == pygame.MOUSEBUTTONDOWN or
+                  event.type == pygame.KEYDOWN and event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL):
+                history.undo()
+            elif (redo_button.rect.collidepoint(mouse) and event.type == pygame.MOUSEBUTTONDOWN or
+                  event.type == pygame.KEYDOWN and event.key == pygame.K_y and event.mod & pygame.KMOD_CTRL):
+                history.redo()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                drawing = True
+                x_start, y_start = event.pos
+                start = x_start, y_start
+                ship_size = (0, 0)
+            elif drawing and event.type == pygame.MOUSEMOTION:
+                x_end, y_end = event.pos
+                end = x_end, y_end
+                ship_size = x_end - x_start, y_end - y_start
+            elif drawing and event.type == pygame.MOUSEBUTTONUP:
+                x_end, y_end = event.pos
+                drawing = False
+                ship_size = (0, 0)
+                start_block = ((x_start - left_margin) // block_size + 1,
+                               (y_start - upper_margin) // block_size + 1)
+                end_block = ((x_end - left_margin) // block_size + 1,
+                             (y_end - upper_margin) // block_size + 1)
+                if start_block > end_block:
+                    start_block, end_block = end_block, start_block
+                temp_ship = []
+                if (0 + offset < start_block[0] < 11 + offset and 0 < start_block[1] < 11 and
+                        0 + offset < end_block[0] < 11 + offset and 0 < end_block[1] < 11):
+                    screen.fill(WHITE, message_rect_for_drawing_ships)
+                    if start_block[0] == end_block[0] and (end_block[1] - start_block[1]) < 4:
+                        for block in range(start_block[1], end_block[1] + 1):
+                            temp_ship.append((start_block[0], block))
+                    elif start_block[1] == end_block[1] and (end_block[0] - start_block[0]) < 4:
+                        for block in range(start_block[0], end_block[0] + 1):
+                            temp_ship.append((block, start_block[1]))
+                    else:
+                        show_message_at_rect_center(
+                            "КОРАБЛЬ СЛИШКОМ БОЛЬШОЙ!", message_rect_for_drawing_ships)
+                else:
+                    show_message_at_rect_center(
+                        "КОРАБЛЬ ЗА ПРЕДЕЛАМИ СЕТКИ!", message_rect_for_drawing_ships)
+                if temp_ship:
+                    if occupancy.is_free(temp_ship):
+                        if check_ships_numbers(temp_ship, num_ships_list):
+                            history.place(temp_ship)
+                        else:
+                            show_message_at_rect_center(
+                                f"ДОСТАТОЧНО {len(temp_ship)}-ПАЛУБНЫХ КОРАБЛЕЙ", message_rect_for_drawing_ships)
+                    else:
+                        show_message_at_rect_center(
+                            "КОРАБЛИ ПРИКАСАЮТСЯ!", message_rect_for_drawing_ships)
+            if len(player_ships_to_draw) == 10:
+                ships_not_created = False
+                screen.fill(WHITE, rect_for_messages_and_buttons)
+        # draw_ships(player_ships_to_draw)
+    pygame.display.update()
+
+
+start_time = time.time()
+AUTO_PLACE_SECONDS = 90
+AUTO_PLACE_EVENT = pygame.USEREVENT + 1
+REPLAY_STEP_EVENT = pygame.USEREVENT + 2
+
+
+def wait_for_events(block=True):
+    """Sleeps until an event arrives and returns it together with the events queued after it
+
+    :param block: whether to wait for an event. Defaults to True, False only takes the queued events
+    :type block: bool
+    :rtype: list[Event]
+    """
+    if not block:
+        return pygame.event.get()
+    return [pygame.event.wait()] + pygame.event.get()
+
+
+def main(opponent=None, fps=30, log=None, profiler=NULL_PROFILER):
+    """the main function responsible for the operation of the entire program
+
+    :param opponent: strategy that plays for player2 (see morskoy_boy.strategies).
+        Defaults to None (two humans)
+    :type opponent: DensityStrategy
+    :param fps: maximum frames per second of the battle
+    :type fps: int
+    :param log: log to write the match to. Defaults to None (no log)
+    :type log: MatchLog
+    :param profiler: profiler of the battle frames, see instrument_game. Defaults to NULL_PROFILER (off)
+    :type profiler: Profiler
+
+    :param game_over: game over or not
+    :type game_over: bool
+    :param drawing: draw or not draw some object
+    :type drawing: bool
+    :param start: The beginning of drawing the ship
+    :type start: tuple[int, int]
+    :param ship_size: ship size
+    :type ship_size: tuple[int, int]
+    :param ships_creation_not_decided: choosing a way to create a ships
+    :type ships_creation_not_decided: bool
+    :param ships_not_created: checks if all ships are built
+    :type ships_not_created: bool
+    :param rect_for_grids: rect for grids
+    :type rect_for_grids: tuple[int, int, int, int]
+    :param rect_for_messages_and_buttons:
+    :type rect_for_messages_and_buttons:
+    :param player1_ships_to_draw: player1 ships to draw
+    :type player1_ships_to_draw: list
+    :param player1_ships_set: player1 ships set
+    :type player1_ships_set: set
+    :param player2_ships_to_draw:  player2 ships to draw
+    :type player2_ships_to_draw: list
+    :param player2_ships_set: player2 ships set
+    :type player2_ships_set: set
+    :param occupancy: blocks on which no ship may be drawn manually
+    :type occupancy: OccupancyGrid
+    :param num_ships_player1_list: stores the number and length of ships for player1
+    :type num_ships_player1_list: tuple[int, int, int, int]
+    :param num_ships_player2_list: stores the number and length of ships for player2
+    :type num_ships_player2_list: tuple[int, int, int, int]
+    :param player1: player 1
+    :type player1: TableShips
+    :param player2: player2
+    :type player2: TableShips
+    :param state: the match being played
+    :type state: GameState
+    :param auto_button: button for auto
+    :type auto_button: Button
+    :param files_button: button for files
+    :type files_button: Button
+    :param manual_button: button for manual
+    :type manual_button:Button
+    """
+    game_over = False
+    drawing = False
+    start = (0, 0)
+    ship_size = (0, 0)
+    ships_creation_not_decided = True
+    ships_not_created = True
+    rect_for_grids = (0, 0, size[0], upper_margin + 12 * block_size)
+    rect_for_messages_and_buttons = (0, upper_margin + 11 * block_size, size[0], 5 * block_size)
+    player1_ships_to_draw = []
+    player1_ships_set = set()
+    player2_ships_to_draw = []
+    player2_ships_set = set()
+    occupancy = OccupancyGrid()
+    num_ships_player1_list = [0, 0, 0, 0]
+    num_ships_player2_list = [0, 0, 0, 0]
+    draw_grids()
+    pygame.display.update()
+
+    remaining_seconds = AUTO_PLACE_SECONDS - (time.time() - start_time)
+    if remaining_seconds > 0:
+        pygame.time.set_timer(AUTO_PLACE_EVENT, max(1, int(remaining_seconds * 1000)), 1)
+    else:
+        pygame.event.post(pygame.event.Event(AUTO_PLACE_EVENT))
+
+    while ships_creation_not_decided:
+        auto_button.draw_button()
+        manual_button.draw_button()
+        files_button.draw_button()
+        auto_button.change_color_on_hover()
+        manual_button.change_color_on_hover()
+        files_button.change_color_on_hover()
+        auto_button.print_message_for_button()
+        pygame.display.update()
+        screen.fill(WHITE, rect_for_messages_and_buttons)
+        events = wait_for_events()
+        mouse = pygame.mouse.get_pos()
+        for event in events:
+            if event.type == pygame.QUIT:
+                game_over = True
+                ships_creation_not_decided = False
+                ships_not_created = False
+            elif event.type == AUTO_PLACE_EVENT or (
+                    event.type == pygame.MOUSEBUTTONDOWN and auto_button.rect.collidepoint(mouse)):
+                player1 = TableShips(0)
+                player2 = TableShips(15)
+                player1_ships_to_draw = player1.ships
+                player1_ships_set = player1.ships_set
+                player2_ships_to_draw = player2.ships
+                player2_ships_set = player2.ships_set
+                ships_creation_not_decided = False
+                ships_not_created = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and files_button.rect.collidepoint(mouse):
+                player1_ships_to_draw, player1_ships_set = files_ships_function('player1_grid.txt')
+                player2_ships_to_draw, player2_ships_set = files_ships_function('player2_grid.txt')
+                ships_creation_not_decided = False
+                ships_not_created = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and manual_button.rect.collidepoint(mouse):
+                ships_creation_not_decided = False
+    pygame.time.set_timer(AUTO_PLACE_EVENT, 0)
+
+    manual_ships(0, drawing, ships_not_created, rect_for_grids,
+                 num_ships_player1_list, player1_ships_set,
+                 rect_for_messages_and_buttons, start, ship_size,
+                 occupancy, player1_ships_to_draw)
+    if opponent is None:
+        manual_ships(15, drawing, ships_not_created, rect_for_grids,
+                     num_ships_player2_list, player2_ships_set,
+                     rect_for_messages_and_buttons, start, ship_size,
+                     occupancy, player2_ships_to_draw)
+    elif not player2_ships_to_draw:
+        player2_ships_to_draw = TableShips(15).ships
+    state = GameState(player1_ships_to_draw, player2_ships_to_draw)
+    if log and not game_over:
+        log.start_match(player1_ships_to_draw, player2_ships_to_draw)
+    renderer = Renderer(fps)
+    winner_shown = False
+
+    while not game_over:
+        # draw_ships(player1_ships_to_draw)
+        # draw_ships(player2_ships_to_draw)
+        computer_turn = opponent and state.player2_turn and state.winner is None
+        events = wait_for_events(not computer_turn)
+        profiler.start_frame()
+        with profiler.phase('events'):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    game_over = True
+                elif event.type == pygame.MOUSEBUTTONDOWN and state.winner is None and not (
+                        opponent and state.player2_turn):
+                    x, y = event.pos
+                    fired_block = ((x - left_margin) // block_size + 1, (y - upper_margin) // block_size + 1)
+                    if x > left_margin and y > upper_margin and state.is_valid_shot(fired_block):
+                        player2_turn = state.player2_turn
+                        result = state.fire(fired_block)
+                        if log:
+                            log.record_shot(player2_turn, fired_block, result)
+        if opponent and state.player2_turn and state.winner is None:
+            with profiler.phase('computer'):
+                fired_block = opponent.next_shot(state)
+                result = state.fire(fired_block)
+                opponent.record(fired_block, result)
+            if log:
+                log.record_shot(True, fired_block, result)
+        renderer.draw_marks(state.dotted_set, state.hit_blocks)
+        if state.winner and not winner_shown:
+            winner_shown = True
+            show_message_at_rect_center(
+                f"ВЫИГРАЛ PLAYER{state.winner}!", (0, 0, size[0], size[1]),
+                pygame.font.SysFont('notosans', font_size + block_size * 2))
+            renderer.add_dirty_rect((0, 0, size[0], size[1]))
+        if len(profiler.frames) % OVERLAY_FRAMES == 1:
+            draw_profiler_overlay(profiler, renderer)
+        renderer.show()
+        profiler.end_frame()
+        renderer.clock.tick(renderer.fps)
+    if log:
+        log.flush()
+
+
+def replay(match, fps=30, step_time=500):
+    """Shows a logged match shot by shot with both fleets visible
+
+    A key press or a click shows the next shot without waiting for step_time.
+
+    :param match: match
+    :type match: Match
+    :param fps: maximum frames per second
+    :type fps: int
+    :param step_time: milliseconds between shots
+    :type step_time: int
+    """
+    draw_grids()
+    draw_ships(match.player1_ships)
+    draw_ships(match.player2_ships)
+    renderer = Renderer(fps)
+    steps = replay_steps(match)
+    state = None
+    game_over = False
+    pygame.time.set_timer(REPLAY_STEP_EVENT, step_time)
+    while not game_over:
+        for event in wait_for_events():
+            if event.type == pygame.QUIT:
+                game_over = True
+            elif event.type in (REPLAY_STEP_EVENT, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN) and steps:
+                step = next(steps, None)
+                if step is None:
+                    steps = None
+                    pygame.time.set_timer(REPLAY_STEP_EVENT, 0)
+                else:
+                    state = step[0]
+        if state:
+            renderer.draw_marks(state.dotted_set, state.hit_blocks)
+        renderer.flush()
+    pygame.time.set_timer(REPLAY_STEP_EVENT, 0)
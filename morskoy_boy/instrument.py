@@ -0,0 +1,185 @@
+"""Frame-time and call-count instrumentation.
+
+Set MORSKOY_BOY_PROFILE=stats.json (or stats.csv) or pass ``--profile FILE`` to the game
+to turn it on. A Profiler splits every frame into named phases: some are timed with
+``with profiler.phase(name)`` in the loop, others by replacing functions of a module or
+class with timing or counting wrappers. When the profiler is off the game uses
+NULL_PROFILER, whose methods do nothing.
+"""
+import contextlib
+import csv
+import functools
+import json
+import os
+import time
+
+ENV_VARIABLE = 'MORSKOY_BOY_PROFILE'
+PERCENTILES = (50, 95, 99)
+
+
+def percentiles(values):
+    """Mean, max and nearest-rank percentiles of a list of numbers
+
+    :param values: values
+    :type values: list[float]
+    :rtype: dict[str, float]
+    """
+    if not values:
+        return {}
+    values = sorted(values)
+    stats = {'count': len(values), 'mean': sum(values) / len(values), 'max': values[-1]}
+    for percentile in PERCENTILES:
+        stats[f'p{percentile}'] = values[max(0, -(-percentile * len(values) // 100) - 1)]
+    return stats
+
+
+class Profiler:
+    """Collects per-frame phase timings and call counts
+
+    :param frames: seconds spent in every phase, one dict per finished frame; the
+        'frame' key holds the whole frame
+    :type frames: list[dict[str, float]]
+    :param calls: function name -> number of calls
+    :type calls: dict[str, int]
+    """
+    def __init__(self):
+        self.frames = []
+        self.calls = {}
+        self.current = {}
+        self.frame_start = None
+        self.patched = []
+
+    def start_frame(self):
+        self.current = {}
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        self.current['frame'] = time.perf_counter() - self.frame_start
+        self.frames.append(self.current)
+        self.current = {}
+        self.frame_start = None
+
+    def add_time(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Adds the time spent in the with block to the phase of the current frame"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start_time)
+
+    def patch(self, owner, names, timed=True, prefix=''):
+        """Replaces functions of a module or class with wrappers that count their calls
+
+        :param owner: module or class
+        :param names: names of the functions
+        :type names: Iterable[str]
+        :param timed: also add the time of every call to a phase with the function's name
+        :type timed: bool
+        :param prefix: prefix of the reported names, e.g. 'display.'
+        :type prefix: str
+        """
+        for name in names:
+            original = getattr(owner, name)
+            self.patched.append((owner, name, original))
+            setattr(owner, name, self.wrap(original, prefix + name, timed))
+
+    def wrap(self, function, name, timed):
+        calls = self.calls
+        calls.setdefault(name, 0)
+        if not timed:
+            @functools.wraps(function)
+            def counted(*args, **kwargs):
+                calls[name] += 1
+                return function(*args, **kwargs)
+            return counted
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            calls[name] += 1
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add_time(name, time.perf_counter() - start_time)
+        return timed_function
+
+    def unpatch(self):
+        """Puts back every function replaced by patch"""
+        while self.patched:
+            owner, name, original = self.patched.pop()
+            setattr(owner, name, original)
+
+    def summary(self):
+        """Percentiles of every phase over the frames, in milliseconds, and call counts
+
+        :rtype: dict
+        """
+        phases = {}
+        for frame in self.frames:
+            for name, seconds in frame.items():
+                phases.setdefault(name, []).append(seconds * 1000)
+        slowest = sorted(self.frames, key=lambda frame: frame['frame'], reverse=True)[:10]
+        return {
+            'frames': len(self.frames),
+            'phases_ms': {name: percentiles(values) for name, values in phases.items()},
+            'calls': dict(self.calls),
+            'slowest_frames_ms': [{name: seconds * 1000 for name, seconds in frame.items()} for frame in slowest],
+        }
+
+    def overlay_text(self):
+        """One line about the recent frames, for drawing over the game"""
+        recent = [frame['frame'] * 1000 for frame in self.frames[-100:]]
+        if not recent:
+            return ''
+        stats = percentiles(recent)
+        return f"frame {recent[-1]:.1f} ms  p50 {stats['p50']:.1f}  p95 {stats['p95']:.1f}  p99 {stats['p99']:.1f}"
+
+    def dump(self, file):
+        """Writes the summary as JSON, or as CSV rows of phases and calls if file ends with .csv
+
+        :param file: file
+        :type file: str
+        """
+        summary = self.summary()
+        with open(file, 'w', newline='') as f:
+            if not file.endswith('.csv'):
+                json.dump(summary, f, indent=2)
+                return
+            writer = csv.writer(f)
+            columns = ['count', 'mean', 'max'] + [f'p{percentile}' for percentile in PERCENTILES]
+            writer.writerow(['name', 'kind'] + columns)
+            for name, stats in summary['phases_ms'].items():
+                writer.writerow([name, 'phase_ms'] + [stats[column] for column in columns])
+            for name, count in summary['calls'].items():
+                writer.writerow([name, 'calls', count] + [''] * (len(columns) - 1))
+
+
+class NullProfiler:
+    """Profiler that records nothing"""
+    frames = ()
+
+    def start_frame(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def phase(self, name):
+        return contextlib.nullcontext()
+
+    def overlay_text(self):
+        return ''
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def profile_file_from_env():
+    """File named by MORSKOY_BOY_PROFILE, or None when profiling is off"""
+    return os.environ.get(ENV_VARIABLE) or None
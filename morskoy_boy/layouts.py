@@ -0,0 +1,151 @@
+"""Compact binary fleet layouts.
+
+A layout is the 100-bit mask of a fleet's blocks stored little-endian in 13 bytes. Ships
+never touch, so every ship is recovered as a run of set bits going right or down from its
+first block; the ships come out longest first, like FLEET. A layout file is just layouts
+written one after another, so libraries of layouts can be read in bulk.
+"""
+import functools
+
+from morskoy_boy.engine import FLEET, fleet_is_valid, files_ships_function
+from morskoy_boy.bitboard import WIDTH, HEIGHT, FULL_MASK, halo_mask, iter_cells, cell_to_block, mask_from_blocks
+
+RECORD_SIZE = (WIDTH * HEIGHT + 7) // 8
+# layouts read from a file at a time
+READ_RECORDS = 4096
+SORTED_FLEET = tuple(sorted(FLEET, reverse=True))
+
+
+def encode_fleet(ships, offset=0):
+    """Packs a fleet into a layout
+
+    :param ships: ships
+    :type ships: list[list[tuple[int, int]]]
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: bytes
+    :raises Warning: if the ships are not a valid fleet
+    """
+    if not fleet_is_valid(ships, offset):
+        raise Warning("ships are not a valid fleet")
+    return mask_from_blocks((block for ship in ships for block in ship), offset).to_bytes(RECORD_SIZE, 'little')
+
+
+def ship_masks_from_mask(mask):
+    """Splits the mask of a fleet into a mask per ship, longest first
+
+    :param mask: blocks of all ships
+    :type mask: int
+    :rtype: list[int]
+    """
+    ship_masks = []
+    left = mask
+    for cell in iter_cells(mask):
+        if not left >> cell & 1:
+            continue
+        step = 1 if cell % WIDTH < WIDTH - 1 and mask >> cell + 1 & 1 else WIDTH
+        ship_mask = 0
+        while cell < WIDTH * HEIGHT and mask >> cell & 1:
+            ship_mask |= 1 << cell
+            if step == 1 and cell % WIDTH == WIDTH - 1:
+                break
+            cell += step
+        left &= ~ship_mask
+        ship_masks.append(ship_mask)
+    ship_masks.sort(key=lambda ship_mask: -ship_mask.bit_count())
+    return ship_masks
+
+
+@functools.lru_cache(maxsize=4096)
+def ship_blocks(ship_mask, offset=0):
+    """Blocks of a ship's mask, cached because a grid only has a few hundred ship placements
+
+    :param ship_mask: ship_mask
+    :type ship_mask: int
+    :param offset: where the grid starts
+    :type offset: int
+    :rtype: tuple[tuple[int, int]]
+    """
+    return tuple(cell_to_block(cell, offset) for cell in iter_cells(ship_mask))
+
+
+def decode_fleet(record, offset=0):
+    """Unpacks a layout
+
+    :param record: layout
+    :type record: bytes
+    :param offset: where the grid starts
+    :type offset: int
+    :return: [ships, ships_set], like files_ships_function
+    :rtype: list
+    :raises Warning: if the layout is not a valid fleet
+    """
+    if len(record) != RECORD_SIZE:
+        raise Warning(f"a layout is {RECORD_SIZE} bytes, got {len(record)}")
+    mask = int.from_bytes(record, 'little')
+    if mask & ~FULL_MASK or mask.bit_count() != sum(FLEET):
+        raise Warning("layout is not a valid fleet")
+    ship_masks = ship_masks_from_mask(mask)
+    if (tuple(ship_mask.bit_count() for ship_mask in ship_masks) != SORTED_FLEET or
+            any(halo_mask(ship_mask) & mask & ~ship_mask for ship_mask in ship_masks)):
+        raise Warning("layout is not a valid fleet")
+    ships = [list(ship_blocks(ship_mask, offset)) for ship_mask in ship_masks]
+    return [ships, set(block for ship in ships for block in ship)]
+
+
+def write_layouts(file, fleets, offset=0):
+    """Writes fleets to a layout file
+
+    :param file: file
+    :type file: str
+    :param fleets: ships of every fleet
+    :type fleets: Iterable[list[list[tuple[int, int]]]]
+    :param offset: where the grids of the fleets start
+    :type offset: int
+    :return: number of layouts written
+    :rtype: int
+    """
+    count = 0
+    with open(file, 'wb') as f:
+        for ships in fleets:
+            f.write(encode_fleet(ships, offset))
+            count += 1
+    return count
+
+
+def read_layouts(file, offset=0):
+    """Yields [ships, ships_set] for every layout of a layout file
+
+    :param file: file
+    :type file: str
+    :param offset: where the grids should start
+    :type offset: int
+    :raises Warning: if the file size is not a multiple of the layout size or a layout is invalid
+    """
+    with open(file, 'rb') as f:
+        while True:
+            data = f.read(RECORD_SIZE * READ_RECORDS)
+            if not data:
+                return
+            if len(data) % RECORD_SIZE:
+                raise Warning(f"{file} is not a sequence of {RECORD_SIZE}-byte layouts")
+            for start in range(0, len(data), RECORD_SIZE):
+                yield decode_fleet(data[start:start + RECORD_SIZE], offset)
+
+
+def load_fleet(file, offset=0):
+    """Loads one fleet from a text file like player1_grid.txt or from a one-layout binary file
+
+    :param file: file
+    :type file: str
+    :param offset: where the grid of a binary layout should start, text files keep their own blocks
+    :type offset: int
+    :return: [ships, ships_set]
+    :rtype: list
+    :raises Warning: if the file does not hold exactly one valid fleet
+    """
+    with open(file, 'rb') as f:
+        data = f.read()
+    if data.lstrip().startswith(b'['):
+        return files_ships_function(file)
+    return decode_fleet(data, offset)
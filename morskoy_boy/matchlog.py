@@ -0,0 +1,152 @@
+"""Append-only log of matches and their replay.
+
+A log is a sequence of records. A match starts with the bytes 0xFF 0x00 followed by the
+13-byte layouts (see morskoy_boy.layouts) of player1's and player2's fleets. Every shot
+after that is two bytes: the cell shot at, with bit 7 set when player2 fired, and the
+result (0 miss, 1 hit, 2 sunk). Writes go through a large file buffer, so logging a shot
+is a memory copy and the disk is only touched when the buffer fills or the log is closed.
+"""
+import itertools
+
+from morskoy_boy.engine import MISS, HIT, SUNK, GameState
+from morskoy_boy.bitboard import WIDTH, HEIGHT, block_to_cell, cell_to_block
+from morskoy_boy.layouts import RECORD_SIZE, encode_fleet, decode_fleet
+
+MATCH_TAG = 0xFF
+PLAYER2_BIT = 0x80
+RESULTS = (MISS, HIT, SUNK)
+RESULT_CODES = {result: code for code, result in enumerate(RESULTS)}
+
+
+class Match:
+    """One logged match
+
+    :param player1_ships: player1's ships (offset 0)
+    :type player1_ships: list[list]
+    :param player2_ships: player2's ships (offset 15)
+    :type player2_ships: list[list]
+    :param shots: (player2_turn, fired_block, result) of every shot, in order
+    :type shots: list[tuple[bool, tuple[int, int], str]]
+    """
+    def __init__(self, player1_ships, player2_ships, shots=None):
+        self.player1_ships = player1_ships
+        self.player2_ships = player2_ships
+        self.shots = shots if shots is not None else []
+
+
+class MatchLog:
+    """Writes matches to the end of a log file
+
+    :param file: file
+    :type file: str
+    :param buffer_size: bytes kept in memory before they are written
+    :type buffer_size: int
+    """
+    def __init__(self, file, buffer_size=65536):
+        self.file = open(file, 'ab', buffering=buffer_size)
+
+    def start_match(self, player1_ships, player2_ships):
+        """Starts a new match
+
+        :param player1_ships: player1's ships (offset 0)
+        :type player1_ships: list[list]
+        :param player2_ships: player2's ships (offset 15)
+        :type player2_ships: list[list]
+        :raises Warning: if a fleet is not valid
+        """
+        self.file.write(bytes((MATCH_TAG, 0)) + encode_fleet(player1_ships, 0) + encode_fleet(player2_ships, 15))
+
+    def record_shot(self, player2_turn, fired_block, result):
+        """Logs a shot of the current match
+
+        :param player2_turn: whether player2 fired
+        :type player2_turn: bool
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :param result: MISS, HIT or SUNK
+        :type result: str
+        """
+        cell = block_to_cell(fired_block, 0 if player2_turn else 15)
+        self.file.write(bytes((cell | PLAYER2_BIT if player2_turn else cell, RESULT_CODES[result])))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_matches(file):
+    """Reads every match of a log
+
+    :param file: file
+    :type file: str
+    :rtype: list[Match]
+    :raises Warning: if the log is damaged
+    """
+    with open(file, 'rb') as f:
+        data = f.read()
+    matches = []
+    pos = 0
+    while pos < len(data):
+        if pos + 2 > len(data):
+            raise Warning(f"{file} ends in the middle of a record")
+        first, second = data[pos], data[pos + 1]
+        if first == MATCH_TAG:
+            layouts = data[pos + 2:pos + 2 + 2 * RECORD_SIZE]
+            if len(layouts) != 2 * RECORD_SIZE:
+                raise Warning(f"{file} ends in the middle of a record")
+            matches.append(Match(decode_fleet(layouts[:RECORD_SIZE], 0)[0],
+                                 decode_fleet(layouts[RECORD_SIZE:], 15)[0]))
+            pos += 2 + 2 * RECORD_SIZE
+            continue
+        if not matches:
+            raise Warning(f"{file} has a shot before the first match")
+        if first & ~PLAYER2_BIT >= WIDTH * HEIGHT or second >= len(RESULTS):
+            raise Warning(f"{file} has a damaged record at byte {pos}")
+        player2_turn = bool(first & PLAYER2_BIT)
+        fired_block = cell_to_block(first & ~PLAYER2_BIT, 0 if player2_turn else 15)
+        matches[-1].shots.append((player2_turn, fired_block, RESULTS[second]))
+        pos += 2
+    return matches
+
+
+def replay_steps(match):
+    """Plays a match through the engine, yielding after every shot
+
+    :param match: match
+    :type match: Match
+    :return: generator of (state after the shot, (player2_turn, fired_block, result))
+    :raises Warning: if a shot is out of turn, invalid or gives another result than logged
+    """
+    state = GameState(match.player1_ships, match.player2_ships)
+    for shot in match.shots:
+        player2_turn, fired_block, result = shot
+        if player2_turn != state.player2_turn:
+            raise Warning(f"shot {fired_block} was logged out of turn")
+        if state.fire(fired_block) != result:
+            raise Warning(f"shot {fired_block} was logged as {result}")
+        yield state, shot
+
+
+def fast_forward(match, shots=None):
+    """Plays the first shots of a match through the engine without rendering
+
+    :param match: match
+    :type match: Match
+    :param shots: number of shots to play. Defaults to None (all of them)
+    :type shots: int
+    :return: the state after those shots
+    :rtype: GameState
+    :raises Warning: like replay_steps
+    """
+    state = GameState(match.player1_ships, match.player2_ships)
+    for state, _ in itertools.islice(replay_steps(match), shots):
+        pass
+    return state
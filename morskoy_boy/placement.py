@@ -0,0 +1,126 @@
+"""Fleet generation from a precomputed table of all legal ship placements.
+
+Every (length, start, orientation) placement on the grid is numbered once, and for each
+placement the table keeps, per ship length, the set of placements that would touch it.
+Those sets are ints used as bitsets over placement numbers, so placing a ship filters the
+candidate pools of all lengths with one ``&`` each. When a ship has no room left the
+generator backtracks to the previous ship instead of recursing.
+"""
+import random
+
+from morskoy_boy.engine import FLEET
+from morskoy_boy.bitboard import WIDTH, HEIGHT, halo_mask, iter_cells, cell_to_block, pick_random_bit
+
+
+class PlacementTable:
+    """All legal placements of ships of every length on an empty grid
+
+    :param lengths: ship lengths to build placements for
+    :type lengths: Iterable[int]
+    :param placements: length -> tuple of (ship_mask, halo_mask) pairs
+    :type placements: dict[int, tuple[tuple[int, int]]]
+    :param conflicts: (length, other_length) -> per placement of length, the placements of
+        other_length that overlap its halo
+    :type conflicts: dict[tuple[int, int], tuple[int]]
+    """
+    def __init__(self, lengths=FLEET):
+        lengths = sorted(set(lengths))
+        self.placements = {}
+        covering = {}
+        for length in lengths:
+            ship_masks = set()
+            for y in range(HEIGHT):
+                for x in range(WIDTH):
+                    if x + length <= WIDTH:
+                        ship_masks.add(sum(1 << (y * WIDTH + x + i) for i in range(length)))
+                    if y + length <= HEIGHT:
+                        ship_masks.add(sum(1 << ((y + i) * WIDTH + x) for i in range(length)))
+            self.placements[length] = tuple((ship_mask, halo_mask(ship_mask)) for ship_mask in sorted(ship_masks))
+            covering[length] = [0] * (WIDTH * HEIGHT)
+            for ind, (ship_mask, _) in enumerate(self.placements[length]):
+                for cell in iter_cells(ship_mask):
+                    covering[length][cell] |= 1 << ind
+        self.conflicts = {}
+        for length in lengths:
+            for other_length in lengths:
+                conflicts = []
+                for _, ship_halo in self.placements[length]:
+                    placements = 0
+                    for cell in iter_cells(ship_halo):
+                        placements |= covering[other_length][cell]
+                    conflicts.append(placements)
+                self.conflicts[length, other_length] = tuple(conflicts)
+
+    def generate(self, fleet=FLEET, rng=random):
+        """Draws a random fleet
+
+        :param fleet: lengths of ships to place, in order
+        :type fleet: tuple[int]
+        :param rng: source of randomness (random module or random.Random)
+        :return: a mask per ship, or None if the fleet does not fit the grid
+        :rtype: list[int] | None
+        :raises Warning: if the table has no placements for a length of the fleet
+        """
+        if not fleet:
+            return []
+        missing_lengths = set(fleet) - set(self.placements)
+        if missing_lengths:
+            raise Warning(f"no placements for ships of length {sorted(missing_lengths)} in the table")
+        alive = {length: (1 << len(self.placements[length])) - 1 for length in set(fleet)}
+        # stack[i] is [placements still free for every length, candidates left for the i-th ship]
+        stack = [[alive, alive[fleet[0]]]]
+        chosen = []
+        while stack:
+            alive, candidates = stack[-1]
+            if not candidates:
+                stack.pop()
+                if chosen:
+                    chosen.pop()
+                continue
+            length = fleet[len(chosen)]
+            ind = pick_random_bit(candidates, len(self.placements[length]), rng)
+            stack[-1][1] = candidates & ~(1 << ind)
+            chosen.append(self.placements[length][ind][0])
+            if len(chosen) == len(fleet):
+                return chosen
+            alive = {other_length: other_alive & ~self.conflicts[length, other_length][ind]
+                     for other_length, other_alive in alive.items()}
+            next_length = fleet[len(chosen)]
+            if next_length == length:
+                # placements that led nowhere for this ship lead nowhere for the next one either
+                stack.append([alive, stack[-1][1] & alive[length]])
+            else:
+                stack.append([alive, alive[next_length]])
+        return None
+
+
+default_table = PlacementTable()
+
+
+class TableShips:
+    """Drop-in alternative to AutoShips built on the placement table
+
+    :param offset: where the grid starts
+    :type offset: int
+    :param rng: source of randomness (random module or random.Random)
+    :param table: placements to draw from
+    :type table: PlacementTable
+    :param ships: list of ships
+    :type ships: list
+    :param ships_set: set of ships
+    :type ships_set: set
+    :param ship_masks: a mask per ship, in the same order as ships
+    :type ship_masks: list[int]
+    :param fleet_mask: blocks of all ships as a bitboard
+    :type fleet_mask: int
+    :raises Warning: if the fleet does not fit the grid
+    """
+    def __init__(self, offset, rng=random, table=default_table):
+        self.offset = offset
+        self.ship_masks = table.generate(FLEET, rng)
+        if self.ship_masks is None:
+            raise Warning("the fleet does not fit the grid")
+        self.ships = [[cell_to_block(cell, offset) for cell in iter_cells(ship_mask)]
+                      for ship_mask in self.ship_masks]
+        self.ships_set = set(block for ship in self.ships for block in ship)
+        self.fleet_mask = sum(self.ship_masks)
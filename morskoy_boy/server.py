@@ -0,0 +1,280 @@
+"""asyncio match server.
+
+Run ``python -m morskoy_boy.server --port 8765``. Clients speak newline-delimited JSON over
+TCP. A client sends ``{"type": "join"}``, optionally with its own "ships", and is paired
+with the next client that joins; the first one plays PLAYER1 on the left grid (offset 0),
+the second PLAYER2 on the right grid (offset 15). Shots are ``{"type": "fire", "block":
+[x, y]}`` at the opponent's grid. Every match has its own GameState; turn order, the
+rules and the winner are decided here, never by the clients.
+
+Server messages:
+
+* ``{"type": "waiting"}`` until an opponent joins
+* ``{"type": "start", "match": id, "player": 1 or 2, "ships": [...], "turn": 1}``
+* ``{"type": "shot", "player": n, "block": [x, y], "result": ..., "dotted": [...],
+  "hits": [...], "turn": n}`` to both players, with the blocks newly dotted and hit
+* ``{"type": "end", "winner": n, "reason": "sunk" | "forfeit"}``
+* ``{"type": "error", "message": ...}`` for a bad request, the connection stays open
+
+A connection that sends nothing for idle_timeout seconds, or that stops reading until
+max_buffer bytes wait to be sent to it, is closed and its opponent wins by forfeit.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+
+from morskoy_boy.engine import GameState, fleet_is_valid
+from morskoy_boy.placement import TableShips
+
+# longest request line a client may send
+MAX_LINE = 64 * 1024
+
+
+class Player:
+    """One connection
+
+    :param reader: reader
+    :type reader: asyncio.StreamReader
+    :param writer: writer
+    :type writer: asyncio.StreamWriter
+    :param number: 1 or 2 once the match started
+    :type number: int
+    :param match: match being played
+    :type match: Match
+    """
+    def __init__(self, reader, writer, max_buffer):
+        self.reader = reader
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.number = None
+        self.match = None
+        self.ships = None
+
+    def send(self, message):
+        """Queues a message, closes the connection if the client does not keep up reading"""
+        if self.writer.is_closing():
+            return
+        self.writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.writer.close()
+
+
+class Match:
+    """A match between two connections
+
+    :param match_id: match_id
+    :type match_id: int
+    :param players: PLAYER1 and PLAYER2
+    :type players: list[Player]
+    :param state: the match's own game state
+    :type state: GameState
+    """
+    def __init__(self, match_id, players):
+        self.match_id = match_id
+        self.players = players
+        self.state = GameState(players[0].ships, players[1].ships)
+        self.winner = None
+        for number, player in enumerate(players, 1):
+            player.number = number
+            player.match = self
+
+    def start(self):
+        for player in self.players:
+            player.send({'type': 'start', 'match': self.match_id, 'player': player.number,
+                         'ships': player.ships, 'turn': 1})
+
+    def fire(self, player, fired_block):
+        """Fires for a player, or returns why it cannot
+
+        :param player: player
+        :type player: Player
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :return: error message or None
+        :rtype: str | None
+        """
+        state = self.state
+        if self.winner is not None:
+            return "the match is over"
+        if state.player2_turn != (player.number == 2):
+            return "not your turn"
+        if not state.is_valid_shot(fired_block):
+            return f"invalid shot {list(fired_block)}"
+        dotted_before = set(state.dotted_set)
+        hits_before = set(state.hit_blocks)
+        result = state.fire(fired_block)
+        message = {'type': 'shot', 'player': player.number, 'block': list(fired_block), 'result': result,
+                   'dotted': sorted(state.dotted_set - dotted_before), 'hits': sorted(state.hit_blocks - hits_before),
+                   'turn': 2 if state.player2_turn else 1}
+        for other in self.players:
+            other.send(message)
+        if state.winner is not None:
+            self.end(state.winner, 'sunk')
+        return None
+
+    def end(self, winner, reason):
+        if self.winner is not None:
+            return
+        self.winner = winner
+        for player in self.players:
+            player.send({'type': 'end', 'winner': winner, 'reason': reason})
+
+
+class MatchServer:
+    """Pairs connections into matches and referees them
+
+    :param host: host
+    :type host: str
+    :param port: port, 0 picks a free one
+    :type port: int
+    :param idle_timeout: seconds a connection may stay silent
+    :type idle_timeout: float
+    :param max_buffer: bytes that may wait to be sent to a client that does not read
+    :type max_buffer: int
+    :param matches: matches being played, by id
+    :type matches: dict[int, Match]
+    """
+    def __init__(self, host='127.0.0.1', port=8765, idle_timeout=300.0, max_buffer=64 * 1024):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_buffer = max_buffer
+        self.matches = {}
+        self.waiting = None
+        self.match_ids = itertools.count(1)
+        self.server = None
+
+    async def start(self):
+        """Starts listening, self.port is the real port afterwards"""
+        self.server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_LINE)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        player = Player(reader, writer, self.max_buffer)
+        try:
+            while not writer.is_closing():
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except (asyncio.TimeoutError, ValueError, ConnectionError):
+                    break
+                if not line:
+                    break
+                self.handle_request(player, line)
+                await asyncio.wait_for(writer.drain(), self.idle_timeout)
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            self.disconnect(player)
+            writer.close()
+
+    def handle_request(self, player, line):
+        try:
+            request = json.loads(line)
+            kind = request['type']
+        except (ValueError, TypeError, KeyError):
+            player.send({'type': 'error', 'message': "expected a JSON object with a type"})
+            return
+        if kind == 'join':
+            self.join(player, request.get('ships'))
+        elif kind == 'fire':
+            error = "join a match first"
+            if player.match is not None:
+                try:
+                    x, y = request['block']
+                    error = player.match.fire(player, (int(x), int(y)))
+                except (KeyError, ValueError, TypeError):
+                    error = "block must be [x, y]"
+            if error:
+                player.send({'type': 'error', 'message': error})
+        elif kind == 'quit':
+            player.writer.close()
+        else:
+            player.send({'type': 'error', 'message': f"unknown request type {kind!r}"})
+
+    def join(self, player, ships):
+        if player.match is not None or player is self.waiting:
+            player.send({'type': 'error', 'message': "already joined"})
+            return
+        offset = 15 if self.waiting else 0
+        if ships is None:
+            player.ships = TableShips(offset).ships
+        else:
+            try:
+                player.ships = [[(int(x), int(y)) for x, y in ship] for ship in ships]
+            except (ValueError, TypeError):
+                player.ships = None
+            if player.ships is None or not fleet_is_valid(player.ships, offset):
+                player.ships = None
+                player.send({'type': 'error', 'message': f"ships are not a valid fleet on the grid at offset {offset}"})
+                return
+        if self.waiting is None:
+            self.waiting = player
+            player.send({'type': 'waiting'})
+            return
+        match = Match(next(self.match_ids), [self.waiting, player])
+        self.waiting = None
+        self.matches[match.match_id] = match
+        match.start()
+
+    def disconnect(self, player):
+        if self.waiting is player:
+            self.waiting = None
+        match = player.match
+        if match is None:
+            return
+        if match.winner is None:
+            match.end(3 - player.number, 'forfeit')
+        self.matches.pop(match.match_id, None)
+
+
+class MatchClient:
+    """Minimal client of the server, for scripts, bots and tests"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode() + b'\n')
+        await self.writer.drain()
+
+    async def receive(self):
+        """Next server message, or None when the server closed the connection"""
+        line = await self.reader.readline()
+        return json.loads(line) if line else None
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m morskoy_boy.server', description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--idle-timeout', type=float, default=300.0)
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = MatchServer(args.host, args.port, args.idle_timeout)
+        await server.start()
+        print(f"serving on {server.host}:{server.port}")
+        await server.server.serve_forever()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
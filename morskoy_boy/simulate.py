@@ -0,0 +1,188 @@
+"""Headless self-play between computer strategies.
+
+Run ``python -m morskoy_boy.simulate --games 1000000 --workers 16``. Games are split into
+chunks that worker processes play independently; every worker returns counters that are
+merged into one report of throughput, shots per game and win rates.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from morskoy_boy.engine import GameState
+from morskoy_boy.placement import TableShips
+from morskoy_boy.strategies import STRATEGIES
+from morskoy_boy.uniform import UniformShips, default_sampler
+
+# how the fleets of every game are drawn
+LAYOUTS = {'table': TableShips, 'uniform': UniformShips}
+
+
+def play_match(player1_strategy, player2_strategy, player1_ships, player2_ships):
+    """Plays one match to the end
+
+    :param player1_strategy: strategy of player1, shooting at the grid with offset 15
+    :param player2_strategy: strategy of player2, shooting at the grid with offset 0
+    :param player1_ships: player1's ships
+    :type player1_ships: list[list]
+    :param player2_ships: player2's ships
+    :type player2_ships: list[list]
+    :return: winner (1 or 2), player1's shots, player2's shots
+    :rtype: tuple[int, int, int]
+    """
+    state = GameState(player1_ships, player2_ships)
+    shots = [0, 0]
+    while state.winner is None:
+        strategy = player2_strategy if state.player2_turn else player1_strategy
+        shots[state.player2_turn] += 1
+        fired_block = strategy.next_shot(state)
+        strategy.record(fired_block, state.fire(fired_block))
+    return state.winner, shots[0], shots[1]
+
+
+def play_chunk(task):
+    """Plays a chunk of games in a worker
+
+    :param task: (number of games, player1's strategy name, player2's strategy name, seed,
+        name of the layouts)
+    :type task: tuple[int, str, str, int, str]
+    :return: counters of wins, of the winner's shots per game and of all shots per game
+    :rtype: dict[str, Counter]
+    """
+    games, player1_name, player2_name, seed, layouts = task
+    ships = LAYOUTS[layouts]
+    rng = random.Random(seed)
+    result = {'wins': Counter(), 'winner_shots': Counter(), 'total_shots': Counter()}
+    for _ in range(games):
+        winner, player1_shots, player2_shots = play_match(
+            STRATEGIES[player1_name](15, rng), STRATEGIES[player2_name](0, rng),
+            ships(0, rng).ships, ships(15, rng).ships)
+        result['wins'][winner] += 1
+        result['winner_shots'][player1_shots if winner == 1 else player2_shots] += 1
+        result['total_shots'][player1_shots + player2_shots] += 1
+    return result
+
+
+def merge_results(results):
+    """Adds up the counters returned by play_chunk
+
+    :param results: results of play_chunk
+    :type results: Iterable[dict[str, Counter]]
+    :rtype: dict[str, Counter]
+    """
+    merged = {'wins': Counter(), 'winner_shots': Counter(), 'total_shots': Counter()}
+    for result in results:
+        for key, counter in result.items():
+            merged[key].update(counter)
+    return merged
+
+
+def distribution(counter):
+    """Mean, min, max and percentiles of a {value: count} counter
+
+    :param counter: counter
+    :type counter: Counter
+    :rtype: dict[str, float]
+    """
+    total = sum(counter.values())
+    if not total:
+        return {}
+    values = sorted(counter)
+    stats = {'mean': sum(value * count for value, count in counter.items()) / total,
+             'min': values[0], 'max': values[-1]}
+    percentiles = [50, 90, 99]
+    seen = 0
+    for value in values:
+        seen += counter[value]
+        while percentiles and seen * 100 >= percentiles[0] * total:
+            stats[f'p{percentiles.pop(0)}'] = value
+    return stats
+
+
+def simulate(games, player1='hunt', player2='hunt', workers=None, chunk_size=1000, seed=None, layouts='table'):
+    """Plays games in a process pool
+
+    :param games: number of games
+    :type games: int
+    :param player1: player1's strategy name
+    :type player1: str
+    :param player2: player2's strategy name
+    :type player2: str
+    :param workers: number of processes. Defaults to None (one per CPU), 1 plays in this process
+    :type workers: int
+    :param chunk_size: games per task sent to a worker
+    :type chunk_size: int
+    :param seed: seed of the whole run. Defaults to None (random)
+    :type seed: int
+    :param layouts: 'table' (TableShips) or 'uniform' (UniformShips, every layout equally likely)
+    :type layouts: str
+    :return: report
+    :rtype: dict
+    """
+    for name in (player1, player2):
+        if name not in STRATEGIES:
+            raise Warning(f"unknown strategy {name}, choose one of {sorted(STRATEGIES)}")
+    if layouts not in LAYOUTS:
+        raise Warning(f"unknown layouts {layouts}, choose one of {sorted(LAYOUTS)}")
+    if layouts == 'uniform':
+        # loaded or built once here, the workers inherit it
+        default_sampler()
+    seeds = random.Random(seed)
+    tasks = []
+    for start in range(0, games, chunk_size):
+        tasks.append((min(chunk_size, games - start), player1, player2, seeds.getrandbits(64), layouts))
+    start_time = time.perf_counter()
+    if workers == 1:
+        merged = merge_results(map(play_chunk, tasks))
+    else:
+        with Pool(workers) as pool:
+            merged = merge_results(pool.imap_unordered(play_chunk, tasks))
+    seconds = time.perf_counter() - start_time
+    return {
+        'games': games,
+        'player1': player1,
+        'player2': player2,
+        'layouts': layouts,
+        'seconds': seconds,
+        'games_per_second': games / seconds if seconds else 0.0,
+        'win_rate': {f'player{winner}': merged['wins'][winner] / games if games else 0.0 for winner in (1, 2)},
+        'winner_shots': distribution(merged['winner_shots']),
+        'total_shots': distribution(merged['total_shots']),
+    }
+
+
+def print_report(report):
+    print(f"{report['games']} games of {report['player1']} vs {report['player2']} on {report['layouts']} layouts "
+          f"in {report['seconds']:.2f}s: {report['games_per_second']:.0f} games/s")
+    for player, rate in report['win_rate'].items():
+        print(f"  {player} wins {rate:.2%}")
+    for key in ('winner_shots', 'total_shots'):
+        stats = ', '.join(f'{name} {value:.1f}' if isinstance(value, float) else f'{name} {value}'
+                          for name, value in report[key].items())
+        print(f"  {key.replace('_', ' ')} per game: {stats}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m morskoy_boy.simulate', description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--player1', choices=sorted(STRATEGIES), default='hunt')
+    parser.add_argument('--player2', choices=sorted(STRATEGIES), default='hunt')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--layouts', choices=sorted(LAYOUTS), default='table',
+                        help='uniform draws every layout with the same probability')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args(argv)
+    report = simulate(args.games, args.player1, args.player2, args.workers, args.chunk_size, args.seed, args.layouts)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""Shooting strategies for computer players.
+
+A strategy plays one side of a GameState. It only looks at what a human player sees on
+the screen, the dotted and hit blocks of the opponent's grid, and at the results of its
+own shots; it never looks at the opponent's ships.
+"""
+import functools
+import random
+import time
+
+from morskoy_boy.engine import MISS, HIT, SUNK, FLEET
+from morskoy_boy.bitboard import NEIGHBOUR_MASKS, DIAGONAL_MASKS, WIDTH, HEIGHT, block_to_cell, cell_to_block, iter_cells
+from morskoy_boy.placement import default_table
+from morskoy_boy.endgame import MAX_LAYOUTS, EndgameSolver
+
+
+class RandomStrategy:
+    """Shoots at a random block that was not shot at or dotted yet
+
+    :param offset: where the opponent's grid starts
+    :type offset: int
+    :param rng: source of randomness (random module or random.Random)
+    :param blocks: blocks of the opponent's grid that were not tried yet
+    :type blocks: list[tuple[int, int]]
+    """
+    def __init__(self, offset, rng=random):
+        self.offset = offset
+        self.rng = rng
+        self.blocks = [(x, y) for x in range(1 + offset, 11 + offset) for y in range(1, 11)]
+
+    def pop_random_block(self, state, blocks):
+        """Removes and returns a random block of blocks that is still open on state's grid"""
+        while blocks:
+            ind = int(self.rng.random() * len(blocks))
+            blocks[ind], blocks[-1] = blocks[-1], blocks[ind]
+            block = blocks.pop()
+            if block not in state.dotted_set and block not in state.hit_blocks:
+                return block
+        return None
+
+    def next_shot(self, state):
+        """Chooses a block to fire at
+
+        :param state: the match being played, it must be this strategy's turn
+        :type state: GameState
+        :rtype: tuple[int, int]
+        """
+        return self.pop_random_block(state, self.blocks)
+
+    def record(self, fired_block, result):
+        """Learns the result of a shot
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :param result: MISS, HIT or SUNK
+        :type result: str
+        """
+
+
+class HuntTargetStrategy(RandomStrategy):
+    """Hunts on a checkerboard until a hit, then finishes the hit ship along its line
+
+    :param wounded: hit blocks of the ship that is not destroyed yet
+    :type wounded: list[tuple[int, int]]
+    """
+    def __init__(self, offset, rng=random):
+        super().__init__(offset, rng)
+        self.odd_blocks = [block for block in self.blocks if (block[0] - offset + block[1]) % 2]
+        self.blocks = [block for block in self.blocks if not (block[0] - offset + block[1]) % 2]
+        self.wounded = []
+
+    def next_shot(self, state):
+        if self.wounded:
+            for block in self.target_blocks():
+                if state.is_valid_shot(block):
+                    return block
+        return self.pop_random_block(state, self.blocks) or self.pop_random_block(state, self.odd_blocks)
+
+    def target_blocks(self):
+        """Blocks that can continue the wounded ship, in the order to try them"""
+        xs = sorted(block[0] for block in self.wounded)
+        ys = sorted(block[1] for block in self.wounded)
+        if len(self.wounded) == 1:
+            x, y = self.wounded[0]
+            return [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+        if xs[0] == xs[-1]:
+            return [(xs[0], ys[0] - 1), (xs[0], ys[-1] + 1)]
+        return [(xs[0] - 1, ys[0]), (xs[-1] + 1, ys[0])]
+
+    def record(self, fired_block, result):
+        if result == HIT:
+            self.wounded.append(fired_block)
+        elif result == SUNK:
+            self.wounded = []
+
+
+@functools.lru_cache(maxsize=None)
+def placement_cells(table):
+    """Cells of every placement of a PlacementTable, the placements covering every cell and
+    the number of placements covering every cell, per ship length of FLEET
+
+    :param table: placement table
+    :type table: PlacementTable
+    :rtype: tuple[dict, dict, dict]
+    """
+    placements = {length: [tuple(iter_cells(ship_mask)) for ship_mask, _ in table.placements[length]]
+                  for length in set(FLEET)}
+    covering = {}
+    counts = {}
+    for length, length_placements in placements.items():
+        covering[length] = [[] for _ in range(WIDTH * HEIGHT)]
+        counts[length] = [0] * (WIDTH * HEIGHT)
+        for ind, cells in enumerate(length_placements):
+            for cell in cells:
+                covering[length][cell].append(ind)
+                counts[length][cell] += 1
+    return placements, covering, counts
+
+
+class DensityStrategy:
+    """Shoots at the block covered by the most ship placements that are still possible
+
+    Every placement of every remaining ship that does not cover a dotted block or a
+    destroyed ship is counted per block, weighted by how many ships of that length are
+    left. After a shot only the placements covering the newly dotted blocks are removed, so
+    the map is never recounted from scratch. While a ship is wounded only the placements
+    that contain all of its hit blocks are counted.
+
+    :param offset: where the opponent's grid starts
+    :type offset: int
+    :param rng: source of randomness (random module or random.Random), breaks ties
+    :param time_budget: seconds a move may take, exceeding it is counted in over_budget
+    :type time_budget: float
+    :param density: weighted number of possible placements covering each cell
+    :type density: list[int]
+    :param remaining: length -> number of ships of that length that are not destroyed
+    :type remaining: dict[int, int]
+    :param wounded: hit cells of the ship that is not destroyed yet
+    :type wounded: list[int]
+    """
+    def __init__(self, offset, rng=random, time_budget=0.002, table=default_table):
+        self.offset = offset
+        self.rng = rng
+        self.time_budget = time_budget
+        self.last_latency = 0.0
+        self.over_budget = 0
+        self.placements, self.covering, counts = placement_cells(table)
+        self.counts = {length: list(length_counts) for length, length_counts in counts.items()}
+        self.alive = {length: bytearray([1]) * len(placements) for length, placements in self.placements.items()}
+        self.remaining = {length: FLEET.count(length) for length in set(FLEET)}
+        self.density = [sum(self.remaining[length] * self.counts[length][cell] for length in self.counts)
+                        for cell in range(WIDTH * HEIGHT)]
+        self.blocked = 0
+        self.hits = 0
+        self.wounded = []
+
+    def block_cells(self, mask):
+        """Removes the placements that cover newly blocked cells from the map"""
+        mask &= ~self.blocked
+        self.blocked |= mask
+        for cell in iter_cells(mask):
+            for length, covering in self.covering.items():
+                alive = self.alive[length]
+                weight = self.remaining[length]
+                for ind in covering[cell]:
+                    if alive[ind]:
+                        alive[ind] = 0
+                        counts = self.counts[length]
+                        for placement_cell in self.placements[length][ind]:
+                            counts[placement_cell] -= 1
+                            self.density[placement_cell] -= weight
+
+    def next_shot(self, state):
+        """Chooses a block to fire at
+
+        :param state: the match being played, it must be this strategy's turn
+        :type state: GameState
+        :rtype: tuple[int, int]
+        """
+        start_time = time.perf_counter()
+        shot = self.open_cells()
+        if self.wounded:
+            scores = self.target_scores()
+        else:
+            scores = self.density
+        best = -1
+        best_cells = []
+        for cell in iter_cells(shot):
+            if scores[cell] > best:
+                best = scores[cell]
+                best_cells = [cell]
+            elif scores[cell] == best:
+                best_cells.append(cell)
+        cell = best_cells[int(self.rng.random() * len(best_cells))]
+        self.last_latency = time.perf_counter() - start_time
+        if self.last_latency > self.time_budget:
+            self.over_budget += 1
+        return cell_to_block(cell, self.offset)
+
+    def open_cells(self):
+        """Mask of cells that were neither shot at nor dotted"""
+        return ((1 << WIDTH * HEIGHT) - 1) & ~self.blocked & ~self.hits
+
+    def target_scores(self):
+        """Counts, per cell, the possible placements that contain every wounded cell"""
+        scores = [0] * (WIDTH * HEIGHT)
+        wounded_cells = set(self.wounded)
+        for length, placements in self.placements.items():
+            weight = self.remaining[length]
+            if not weight or length <= len(self.wounded):
+                continue
+            alive = self.alive[length]
+            for ind in self.covering[length][self.wounded[0]]:
+                if alive[ind] and wounded_cells.issubset(placements[ind]):
+                    for cell in placements[ind]:
+                        scores[cell] += weight
+        return scores
+
+    def record(self, fired_block, result):
+        """Learns the result of a shot and updates the map
+
+        :param fired_block: fired_block
+        :type fired_block: tuple[int, int]
+        :param result: MISS, HIT or SUNK
+        :type result: str
+        """
+        cell = block_to_cell(fired_block, self.offset)
+        if result == MISS:
+            self.block_cells(1 << cell)
+            return
+        self.hits |= 1 << cell
+        self.wounded.append(cell)
+        if result == HIT:
+            self.block_cells(DIAGONAL_MASKS[cell])
+            return
+        length = len(self.wounded)
+        ship_halo = 0
+        for ship_cell in self.wounded:
+            ship_halo |= NEIGHBOUR_MASKS[ship_cell]
+        self.wounded = []
+        self.block_cells(ship_halo)
+        self.remaining[length] -= 1
+        for cell, count in enumerate(self.counts[length]):
+            self.density[cell] -= count
+
+
+class EndgameStrategy(DensityStrategy):
+    """Plays like DensityStrategy until few ships are left, then lets an EndgameSolver pick
+    every shot
+
+    :param max_ships: the solver is tried once at most this many ships are left
+    :type max_ships: int
+    :param max_layouts: the solver takes over once at most this many layouts agree with the grid
+    :type max_layouts: int
+    :param solver: the solver once it took over
+    :type solver: EndgameSolver
+    """
+    def __init__(self, offset, rng=random, time_budget=0.05, table=default_table, max_ships=4,
+                 max_layouts=MAX_LAYOUTS):
+        super().__init__(offset, rng, time_budget, table)
+        self.max_ships = max_ships
+        self.max_layouts = max_layouts
+        self.solver = None
+
+    def next_shot(self, state):
+        if self.solver is None and sum(self.remaining.values()) <= self.max_ships:
+            self.solver = EndgameSolver.from_view(self.blocked, self.hits, FLEET, self.max_layouts,
+                                                  time_budget=self.time_budget)
+        if self.solver is None:
+            return super().next_shot(state)
+        start_time = time.perf_counter()
+        cell, _ = self.solver.best_shot()
+        self.last_latency = time.perf_counter() - start_time
+        if self.last_latency > self.time_budget:
+            self.over_budget += 1
+        return cell_to_block(cell, self.offset)
+
+    def record(self, fired_block, result):
+        if self.solver is None:
+            super().record(fired_block, result)
+        else:
+            self.solver.apply(block_to_cell(fired_block, self.offset), result)
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'hunt': HuntTargetStrategy,
+    'density': DensityStrategy,
+    'endgame': EndgameStrategy,
+}
@@ -1,6 +1,25 @@
+import asyncio
+import copy
+import os
+import random
 import unittest
+from collections import Counter
 import pytest
 from morskoy_boy import *
+from morskoy_boy.placement import TableShips, PlacementTable
+from morskoy_boy.fleets import generate_fleets, fleet_to_ships
+from morskoy_boy.simulate import simulate, distribution
+from morskoy_boy.strategies import DensityStrategy, HuntTargetStrategy, EndgameStrategy
+from morskoy_boy.layouts import encode_fleet, decode_fleet, write_layouts, read_layouts, load_fleet, RECORD_SIZE
+from morskoy_boy.matchlog import Match, MatchLog, read_matches, replay_steps, fast_forward
+from morskoy_boy.bench import run_benchmarks, compare
+from morskoy_boy.instrument import Profiler, percentiles
+from morskoy_boy import engine
+from morskoy_boy.server import MatchServer, MatchClient
+from morskoy_boy.corpus import LayoutCorpus, write_corpus, records_to_grids
+from morskoy_boy.uniform import UniformSampler, UniformShips
+from morskoy_boy.endgame import EndgameSolver, analyse_match
+from morskoy_boy.bitboard import FULL_MASK, mask_from_blocks
 
 
 class MyTestCase(unittest.TestCase):
@@ -36,6 +55,40 @@ class MyTestCase(unittest.TestCase):
             with pytest.raises(Warning):
                 pass
 
+    def test_placement_history(self):
+        history = PlacementHistory(limit=3)
+        first, second = [(1, 1), (2, 1)], [(1, 3)]
+        history.place(first)
+        history.place(second)
+        # (1, 2) and (2, 2) are next to both ships and stay taken when one is undone
+        self.assertEqual(history.occupancy.counts[(1, 2)], 2)
+        self.assertFalse(history.occupancy.is_free([(2, 2)]))
+        with pytest.raises(Warning):
+            history.place([(3, 2)])
+        self.assertEqual(history.undo(), second)
+        self.assertFalse(history.occupancy.is_free([(2, 2)]))
+        self.assertTrue(history.occupancy.is_free([(1, 4)]))
+        self.assertEqual(history.ships, [first])
+        self.assertEqual(history.ships_set, set(first))
+        self.assertEqual(history.num_ships_list, [0, 1, 0, 0])
+        self.assertEqual(history.redo(), second)
+        self.assertIsNone(history.redo())
+        self.assertEqual(history.occupancy.counts,
+                         {**{block: 1 for block in ship_halo(first) ^ ship_halo(second)},
+                          **{block: 2 for block in ship_halo(first) & ship_halo(second)}})
+        history.undo()
+        history.place([(5, 5)])
+        self.assertFalse(history.can_redo())
+        history.place([(8, 8)])
+        history.place([(8, 1)])
+        while history.undo():
+            pass
+        # only the last three placements could be undone
+        self.assertEqual(history.ships, [first])
+        self.assertEqual(history.occupancy.counts, {block: 1 for block in ship_halo(first)})
+        with pytest.raises(Warning):
+            history.occupancy.remove([(9, 9)])
+
 
 
     def test_ship_is_valid(self):
@@ -107,6 +160,482 @@ class MyTestCase(unittest.TestCase):
             with pytest.raises(Warning):
                 pass
 
+    def test_parse_ships(self):
+        self.assertEqual(parse_ships('[[(1, 1), (2, 1)],\n [(5, 5)]]\n'), [[(1, 1), (2, 1)], [(5, 5)]])
+        for text in ('[[(1, 1)]', '[[(1, 1)]]]', '[(1, 1)]', '[[[(1, 1)]]]', '[[(1, 1)]] [[(2, 2)]]',
+                     '[[(1, 1)], __import__("os")]', '[[(1, a)]]'):
+            with pytest.raises(Warning):
+                parse_ships(text)
+
+    def test_fleet_is_valid(self):
+        ships = files_ships_function('player_grid_for_test.txt')[0]
+        self.assertTrue(fleet_is_valid(ships))
+        self.assertFalse(fleet_is_valid(ships, 15))
+        self.assertFalse(fleet_is_valid(ships[1:]))
+        touching = [ship[:] for ship in ships]
+        touching[-1] = [(8, 4)]
+        self.assertFalse(fleet_is_valid(touching))
+        bent = [ship[:] for ship in ships]
+        bent[0][0] = (7, 4)
+        self.assertFalse(fleet_is_valid(bent))
+
+    def test_layouts(self):
+        fleets = [TableShips(15, random.Random(seed)).ships for seed in range(50)]
+        for ships in fleets:
+            record = encode_fleet(ships, 15)
+            self.assertEqual(len(record), RECORD_SIZE)
+            decoded_ships, decoded_set = decode_fleet(record, 15)
+            self.assertEqual(sorted(map(sorted, decoded_ships)), sorted(map(sorted, ships)))
+            self.assertEqual([len(ship) for ship in decoded_ships], list(FLEET))
+            self.assertEqual(decoded_set, set(block for ship in ships for block in ship))
+        with pytest.raises(Warning):
+            decode_fleet(bytes(RECORD_SIZE))
+        with pytest.raises(Warning):
+            decode_fleet(b'\xff' * RECORD_SIZE)
+        with pytest.raises(Warning):
+            encode_fleet(fleets[0][1:], 15)
+
+    def test_layout_files(self):
+        fleets = [TableShips(0, random.Random(seed)).ships for seed in range(20)]
+        self.assertEqual(write_layouts('test_layouts.bin', fleets), 20)
+        try:
+            self.assertEqual([sorted(map(sorted, ships)) for ships, _ in read_layouts('test_layouts.bin')],
+                             [sorted(map(sorted, ships)) for ships in fleets])
+            with open('test_layouts.bin', 'wb') as f:
+                f.write(encode_fleet(fleets[0]))
+            self.assertEqual(load_fleet('test_layouts.bin', 15)[1],
+                             set((x + 15, y) for ship in fleets[0] for x, y in ship))
+            self.assertEqual(load_fleet('player1_grid.txt'), files_ships_function('player1_grid.txt'))
+            with open('test_layouts.bin', 'ab') as f:
+                f.write(b'\x00')
+            with pytest.raises(Warning):
+                list(read_layouts('test_layouts.bin'))
+        finally:
+            os.remove('test_layouts.bin')
+
+    def test_layout_corpus(self):
+        grids, ship_ids = generate_fleets(300, seed=5)
+        self.assertEqual(write_corpus('test_corpus.bin', grids[:200]), 200)
+        self.assertEqual(write_corpus('test_corpus.bin', grids[200:], append=True), 100)
+        try:
+            with LayoutCorpus('test_corpus.bin', 15) as corpus:
+                self.assertEqual(len(corpus), 300)
+                batches = list(corpus.batches(128))
+                self.assertEqual([len(batch) for batch in batches], [128, 128, 44])
+                self.assertTrue((records_to_grids(batches[1]) == grids[128:256]).all())
+                for index in (0, 17, -1):
+                    ships, ships_set = corpus[index]
+                    self.assertEqual(ships_set, fleet_to_ships(ship_ids[index], 15)[1])
+                    self.assertEqual([len(ship) for ship in ships], list(FLEET))
+                self.assertEqual(sum(1 for _ in corpus), 300)
+                self.assertEqual(len(corpus.sample(10, rng=1)), 10)
+            self.assertEqual(len(corpus), 0)
+            with open('test_corpus.bin', 'ab') as f:
+                f.write(b'\x00')
+            with pytest.raises(Warning):
+                LayoutCorpus('test_corpus.bin')
+        finally:
+            os.remove('test_corpus.bin')
+
+    def test_match_log(self):
+        rng = random.Random(3)
+        fleets = []
+        try:
+            with MatchLog('test_match.log') as log:
+                for _ in range(3):
+                    player1_ships, player2_ships = TableShips(0, rng).ships, TableShips(15, rng).ships
+                    fleets.append((player1_ships, player2_ships))
+                    log.start_match(player1_ships, player2_ships)
+                    state = GameState(player1_ships, player2_ships)
+                    strategies = {False: HuntTargetStrategy(15, rng), True: HuntTargetStrategy(0, rng)}
+                    while state.winner is None:
+                        player2_turn = state.player2_turn
+                        fired_block = strategies[player2_turn].next_shot(state)
+                        result = state.fire(fired_block)
+                        strategies[player2_turn].record(fired_block, result)
+                        log.record_shot(player2_turn, fired_block, result)
+            matches = read_matches('test_match.log')
+            self.assertEqual(len(matches), 3)
+            for match, (player1_ships, player2_ships) in zip(matches, fleets):
+                self.assertEqual(sorted(map(sorted, match.player1_ships)), sorted(map(sorted, player1_ships)))
+                replayed = GameState(player1_ships, player2_ships)
+                for state, (player2_turn, fired_block, result) in replay_steps(match):
+                    self.assertEqual(replayed.fire(fired_block), result)
+                    self.assertEqual(state.dotted_set, replayed.dotted_set)
+                self.assertEqual(fast_forward(match).winner, replayed.winner)
+                first_shot = fast_forward(match, 1)
+                self.assertIn(match.shots[0][1], first_shot.hit_blocks | first_shot.dotted_set)
+                self.assertEqual(first_shot.player2_turn, match.shots[1][0])
+            matches[0].shots[0] = (matches[0].shots[0][0], matches[0].shots[0][1], SUNK)
+            with pytest.raises(Warning):
+                fast_forward(matches[0])
+            with open('test_match.log', 'ab') as f:
+                f.write(b'\x00')
+            with pytest.raises(Warning):
+                read_matches('test_match.log')
+        finally:
+            os.remove('test_match.log')
+
+    def test_bench(self):
+        report = run_benchmarks(['used_blocks', 'fleet_file'], repeat=1)
+        self.assertEqual(set(report['results']), {'used_blocks', 'fleet_file'})
+        self.assertTrue(all(result['seconds'] > 0 for result in report['results'].values()))
+        baseline = {'results': {'used_blocks': {'seconds': report['results']['used_blocks']['seconds'] / 2}},
+                    'threshold': 1.5}
+        comparison = compare(report, baseline)
+        self.assertEqual(set(comparison), {'used_blocks'})
+        self.assertTrue(comparison['used_blocks']['regression'])
+        self.assertFalse(compare(report, baseline, threshold=3)['used_blocks']['regression'])
+        with pytest.raises(Warning):
+            run_benchmarks(['no_such_benchmark'])
+
+    def test_profiler(self):
+        self.assertEqual(percentiles(list(range(1, 101))),
+                         {'count': 100, 'mean': 50.5, 'max': 100, 'p50': 50, 'p95': 95, 'p99': 99})
+        profiler = Profiler()
+        original = engine.check_hit_or_miss
+        profiler.patch(engine, ['check_hit_or_miss'], timed=False)
+        profiler.patch(engine, ['update_dotted_and_hit_sets'])
+        try:
+            for _ in range(3):
+                profiler.start_frame()
+                with profiler.phase('events'):
+                    state = GameState([[(1, 1), (2, 1)]], [[(16, 1), (17, 1)]])
+                    state.fire((16, 1))
+                    state.fire((20, 5))
+                profiler.end_frame()
+        finally:
+            profiler.unpatch()
+        self.assertIs(engine.check_hit_or_miss, original)
+        summary = profiler.summary()
+        self.assertEqual(summary['frames'], 3)
+        self.assertEqual(summary['calls'], {'check_hit_or_miss': 6, 'update_dotted_and_hit_sets': 3})
+        self.assertEqual(set(summary['phases_ms']), {'events', 'update_dotted_and_hit_sets', 'frame'})
+        self.assertEqual(summary['phases_ms']['frame']['count'], 3)
+        self.assertTrue(profiler.overlay_text().startswith('frame'))
+
+    def test_match_server(self):
+        async def play():
+            server = MatchServer(port=0, idle_timeout=5)
+            await server.start()
+            clients = [await MatchClient.connect(port=server.port) for _ in range(4)]
+            for client in clients:
+                await client.send({'type': 'join'})
+            self.assertEqual(await clients[0].receive(), {'type': 'waiting'})
+            self.assertEqual(await clients[2].receive(), {'type': 'waiting'})
+            starts = [await client.receive() for client in clients[:2]]
+            self.assertEqual([start['player'] for start in starts], [1, 2])
+            self.assertEqual(starts[0]['match'], starts[1]['match'])
+            self.assertEqual(len(server.matches), 2)
+            await clients[1].send({'type': 'fire', 'block': [1, 1]})
+            self.assertEqual((await clients[1].receive())['message'], "not your turn")
+            await clients[0].send({'type': 'aim'})
+            self.assertEqual((await clients[0].receive())['type'], 'error')
+
+            blocks = {1: [[x, y] for x in range(16, 26) for y in range(1, 11)],
+                      2: [[x, y] for x in range(1, 11) for y in range(1, 11)]}
+            turn = 1
+            while True:
+                player = clients[turn - 1]
+                await player.send({'type': 'fire', 'block': blocks[turn].pop()})
+                message = await player.receive()
+                if message['type'] == 'error':
+                    continue
+                self.assertEqual(await clients[2 - turn].receive(), message)
+                if message['result'] != 'miss':
+                    self.assertIn(message['block'], message['hits'])
+                turn = message['turn']
+                if server.matches[starts[0]['match']].winner:
+                    break
+            end = {'type': 'end', 'winner': message['player'], 'reason': 'sunk'}
+            self.assertEqual(await clients[0].receive(), end)
+            self.assertEqual(await clients[1].receive(), end)
+            self.assertIsNone(server.matches[starts[1]['match'] + 1].winner)
+
+            await clients[3].send({'type': 'quit'})
+            self.assertEqual((await clients[2].receive())['type'], 'start')
+            self.assertEqual(await clients[2].receive(), {'type': 'end', 'winner': 1, 'reason': 'forfeit'})
+            for client in clients:
+                await client.close()
+            await server.close()
+
+        asyncio.run(play())
+
+    def test_match_server_timeout(self):
+        async def wait_alone():
+            server = MatchServer(port=0, idle_timeout=0.2)
+            await server.start()
+            client = await MatchClient.connect(port=server.port)
+            await client.send({'type': 'join', 'ships': [[[1, 1]]]})
+            self.assertEqual((await client.receive())['type'], 'error')
+            await client.send({'type': 'join', 'ships': files_ships_function('player1_grid.txt')[0]})
+            self.assertEqual(await client.receive(), {'type': 'waiting'})
+            self.assertIsNone(await asyncio.wait_for(client.receive(), 2))
+            self.assertIsNone(server.waiting)
+            await client.close()
+            await server.close()
+
+        asyncio.run(wait_alone())
+
+    def test_board_config(self):
+        self.assertEqual([column_name(column) for column in (0, 9, 25, 26, 701, 702)],
+                         ['A', 'J', 'Z', 'AA', 'ZZ', 'AAA'])
+        config = BoardConfig(30, 12, (5, 4, 4, 1, 1))
+        self.assertEqual(config.player2_offset, 35)
+        for offset in (0, config.player2_offset):
+            ships = AutoShips(offset, config).ships
+            self.assertEqual([len(ship) for ship in ships], [5, 4, 4, 1, 1])
+            self.assertTrue(fleet_is_valid(ships, offset, config))
+            self.assertFalse(fleet_is_valid(ships, offset))
+        state = GameState([[(30, 12)]], [[(36, 1), (37, 1)]], config)
+        self.assertTrue(state.is_valid_shot((65, 12)))
+        self.assertFalse(state.is_valid_shot((66, 12)))
+        self.assertEqual(state.fire((65, 12)), MISS)
+        self.assertEqual(state.fire((30, 12)), SUNK)
+        self.assertEqual(state.dotted_set, {(65, 12), (29, 11), (30, 11), (29, 12)})
+        self.assertEqual(state.winner, 2)
+
+        mega = BoardConfig(1000, 1000, (4,) * 50 + (1,) * 200)
+        ships = AutoShips(mega.player2_offset, mega).ships
+        self.assertTrue(fleet_is_valid(ships, mega.player2_offset, mega))
+
+    def test_game_state(self):
+        player1_ships = [[(1, 1), (2, 1)], [(5, 5)]]
+        player2_ships = [[(16, 1), (17, 1)], [(20, 5)]]
+        state = GameState(player1_ships, player2_ships)
+        other_state = GameState(player1_ships, player2_ships)
+        self.assertEqual(state.fire((16, 1)), HIT)
+        self.assertEqual(state.player2_turn, False)
+        self.assertEqual(state.fire((17, 1)), SUNK)
+        self.assertEqual(state.fire((25, 10)), MISS)
+        self.assertEqual(state.player2_turn, True)
+        self.assertFalse(state.is_valid_shot((25, 10)))
+        self.assertTrue(state.is_valid_shot((1, 1)))
+        self.assertEqual(state.fire((5, 5)), SUNK)
+        self.assertEqual(state.fire((1, 1)), HIT)
+        self.assertEqual(state.fire((2, 1)), SUNK)
+        self.assertEqual(state.winner, 2)
+        self.assertEqual(player1_ships, [[(1, 1), (2, 1)], [(5, 5)]])
+        self.assertEqual(other_state.dotted_set, set())
+        self.assertIsNone(other_state.winner)
+
+    def test_game_state_invalid_shot(self):
+        state = GameState([[(1, 1), (2, 1)]], [[(16, 1), (17, 1)]])
+        state.fire((16, 1))
+        for fired_block in ((16, 1), (17, 2), (1, 1), (26, 1), (16, 0)):
+            with pytest.raises(Warning):
+                state.fire(fired_block)
+        self.assertEqual(state.player2_turn, False)
+        self.assertEqual(state.hit_blocks, {(16, 1)})
+        self.assertEqual(state.dotted_set, {(17, 2)})
+
+    def test_bitboard(self):
+        for offset, player2_turn in ((0, True), (15, False)):
+            ships = AutoShips(offset).ships
+            board = BitBoard(ships, offset)
+            state = GameState()
+            ships_working = copy.deepcopy(ships)
+            ships_set = set(block for ship in ships for block in ship)
+            blocks = [(x, y) for x in range(1 + offset, 11 + offset) for y in range(1, 11)]
+            random.shuffle(blocks)
+            for block in blocks:
+                if block in state.dotted_set or block in state.hit_blocks:
+                    continue
+                self.assertEqual(check_hit_or_miss(block, board, player2_turn, None, None),
+                                 check_hit_or_miss(block, ships_working, player2_turn, ships, ships_set, state))
+                self.assertEqual(blocks_from_mask(board.dotted, offset), state.dotted_set)
+                self.assertEqual(blocks_from_mask(board.hits, offset), state.hit_blocks)
+            self.assertTrue(board.all_sunk)
+
+    def test_fleet_index(self):
+        for offset, player2_turn in ((0, True), (15, False)):
+            ships = AutoShips(offset).ships
+            index = FleetIndex(ships)
+            index_state = GameState()
+            index_ships_set = set(block for ship in ships for block in ship)
+            state = GameState()
+            ships_working = copy.deepcopy(ships)
+            ships_set = set(index_ships_set)
+            blocks = [(x, y) for x in range(1 + offset, 11 + offset) for y in range(1, 11)] * 2
+            random.shuffle(blocks)
+            for block in blocks:
+                self.assertEqual(check_hit_or_miss(block, index, player2_turn, ships, index_ships_set, index_state),
+                                 check_hit_or_miss(block, ships_working, player2_turn, ships, ships_set, state))
+                self.assertEqual(index_state.dotted_set, state.dotted_set)
+                self.assertEqual(index_state.hit_blocks, state.hit_blocks)
+                self.assertEqual(index_ships_set, ships_set)
+            self.assertEqual(index.decks_left, [0] * len(ships))
+
+        index = FleetIndex([[(1, 1), (2, 1)], [(5, 5)]])
+        self.assertEqual(index.fire((3, 3)), (MISS, None))
+        self.assertEqual(index.fire((2, 1)), (HIT, 0))
+        self.assertEqual(index.fire((2, 1)), (MISS, None))
+        self.assertEqual(index.fire((1, 1)), (SUNK, 0))
+        self.assertEqual(index.fire((5, 5)), (SUNK, 1))
+
+    def test_bitboard_invalid_shot(self):
+        board = BitBoard([[(1, 2)]], 0)
+        for fired_block in ((11, 1), (0, 0), (1, 11)):
+            with pytest.raises(Warning):
+                board.fire(fired_block)
+        self.assertEqual(board.fire((1, 2)), SUNK)
+        for fired_block in ((1, 2), (2, 2)):
+            with pytest.raises(Warning):
+                board.fire(fired_block)
+        self.assertEqual(board.fire((5, 5)), MISS)
+
+    def test_bit_auto_ships(self):
+        player = BitAutoShips(15)
+        self.assertEqual(sorted(len(ship) for ship in player.ships), [1, 1, 1, 1, 2, 2, 2, 3, 3, 4])
+        self.assertEqual(mask_from_blocks(player.ships_set, 15), player.fleet_mask)
+        used_mask = 0
+        for ship in player.ships:
+            ship_mask = mask_from_blocks(ship, 15)
+            self.assertTrue(ship_is_valid(ship_mask, used_mask))
+            used_mask |= ship_mask
+        self.assertFalse(ship_is_valid(mask_from_blocks(player.ships[0], 15), used_mask))
+
+    def test_table_ships(self):
+        for seed in range(50):
+            player = TableShips(15, random.Random(seed))
+            self.assertEqual([len(ship) for ship in player.ships], list(FLEET))
+            self.assertEqual(len(player.ships_set), 20)
+            used_blocks = set()
+            for ship in player.ships:
+                self.assertTrue(all(15 < x < 26 and 0 < y < 11 for x, y in ship))
+                self.assertTrue(ship_is_valid(set(ship), used_blocks))
+                used_blocks = update_used_blocks(ship, used_blocks)
+        self.assertEqual(TableShips(0, random.Random(1)).ships, TableShips(0, random.Random(1)).ships)
+        self.assertEqual(len(PlacementTable((4,)).placements[4]), 140)
+        self.assertIsNone(PlacementTable((11,)).generate((11,)))
+        self.assertEqual(PlacementTable((4,)).generate(()), [])
+        with pytest.raises(Warning):
+            PlacementTable((4,)).generate((4, 3))
+
+    def test_generate_fleets(self):
+        grids, ship_ids = generate_fleets(300, seed=7, chunk_size=128)
+        self.assertEqual(grids.shape, (300, 10, 10))
+        self.assertEqual(ship_ids.shape, (300, 10, 10))
+        self.assertTrue((grids.sum(axis=(1, 2)) == 20).all())
+        for fleet in ship_ids:
+            ships, ships_set = fleet_to_ships(fleet, 15)
+            self.assertEqual([len(ship) for ship in ships], list(FLEET))
+            used_blocks = set()
+            for ship in ships:
+                self.assertTrue(ship_is_valid(set(ship), used_blocks))
+                used_blocks = update_used_blocks(ship, used_blocks)
+        self.assertTrue((generate_fleets(5, seed=1)[1] == generate_fleets(5, seed=1)[1]).all())
+
+    def test_simulate(self):
+        report = simulate(40, 'random', 'hunt', workers=1, chunk_size=15, seed=3)
+        self.assertEqual(report['games'], 40)
+        self.assertAlmostEqual(sum(report['win_rate'].values()), 1)
+        self.assertTrue(20 <= report['winner_shots']['min'] <= report['winner_shots']['p50'] <= 100)
+        self.assertEqual(report, dict(simulate(40, 'random', 'hunt', workers=1, chunk_size=15, seed=3),
+                                      seconds=report['seconds'], games_per_second=report['games_per_second']))
+        self.assertEqual(distribution(Counter({1: 1, 2: 2, 10: 1})),
+                         {'mean': 3.75, 'min': 1, 'max': 10, 'p50': 2, 'p90': 10, 'p99': 10})
+        with pytest.raises(Warning):
+            simulate(1, 'psychic', 'hunt', workers=1)
+        with pytest.raises(Warning):
+            simulate(1, 'hunt', 'hunt', workers=1, layouts='lucky')
+
+    def test_uniform_sampler(self):
+        config = BoardConfig(4, 4, (2, 1, 1))
+        sampler = UniformSampler(config)
+        # counted by placing the ships in every possible way
+        self.assertEqual(sampler.total, 380)
+        self.assertEqual(UniformSampler(BoardConfig(5, 5, (3, 2, 2, 1))).total, 6508)
+        rng = random.Random(4)
+        layouts = Counter()
+        for _ in range(19000):
+            ships = sampler.sample(6, rng)
+            self.assertEqual([len(ship) for ship in ships], [2, 1, 1])
+            layouts[frozenset(block for ship in ships for block in ship)] += 1
+        self.assertEqual(len(layouts), 380)
+        self.assertTrue(20 < min(layouts.values()) <= max(layouts.values()) < 90)
+        self.assertTrue(all(fleet_is_valid(UniformShips(15, rng, sampler).ships, 15, config) for _ in range(20)))
+        sampler.save('test_uniform.npz')
+        try:
+            loaded = UniformSampler.load('test_uniform.npz')
+            self.assertEqual(loaded.total, 380)
+            self.assertEqual(loaded.config.fleet, config.fleet)
+            self.assertEqual(loaded.sample(0, random.Random(1)), sampler.sample(0, random.Random(1)))
+        finally:
+            os.remove('test_uniform.npz')
+        with pytest.raises(Warning):
+            UniformSampler(BoardConfig(3, 3, (3, 3, 3)))
+
+    def test_density_strategy(self):
+        rng = random.Random(5)
+        state = GameState(TableShips(0, rng).ships, TableShips(15, rng).ships)
+        strategy = DensityStrategy(15, rng)
+        while state.winner is None:
+            if state.player2_turn:
+                state.fire(next((x, y) for x in range(1, 11) for y in range(1, 11)
+                                if (x, y) not in state.player1.ships_set and state.is_valid_shot((x, y))))
+                continue
+            fired_block = strategy.next_shot(state)
+            self.assertTrue(state.is_valid_shot(fired_block))
+            strategy.record(fired_block, state.fire(fired_block))
+            if strategy.wounded:
+                continue
+            for length, placements in strategy.placements.items():
+                alive = [not any(strategy.blocked >> cell & 1 for cell in cells) for cells in placements]
+                self.assertEqual(list(strategy.alive[length]), alive)
+            density = [sum(strategy.remaining[length] * sum(cell in cells for cells, alive in
+                                                            zip(placements, strategy.alive[length]) if alive)
+                           for length, placements in strategy.placements.items()) for cell in range(100)]
+            self.assertEqual(strategy.density, density)
+        self.assertEqual(state.winner, 1)
+        self.assertEqual(strategy.over_budget, 0)
+
+    def test_endgame_solver(self):
+        open_cells = mask_from_blocks([(1, 1), (3, 1), (5, 1), (7, 1)])
+        solver = EndgameSolver.from_view(FULL_MASK & ~open_cells, 0, (1,))
+        self.assertEqual(len(solver.layouts), 4)
+        self.assertEqual(solver.best_shot()[1], 2.5)
+        self.assertTrue(solver.exact)
+        # a sunk ship of two blocks, a wounded ship with its diagonals dotted and 4 ways to go on
+        hits = mask_from_blocks([(1, 1), (2, 1), (5, 5)])
+        dotted = mask_from_blocks([(3, 1), (1, 2), (2, 2), (3, 2), (4, 4), (6, 4), (4, 6), (6, 6)])
+        solver = EndgameSolver.from_view(dotted, hits, (2, 2))
+        self.assertEqual(solver.sunk, mask_from_blocks([(1, 1), (2, 1)]))
+        self.assertEqual(len(solver.layouts), 4)
+        cell, expected = solver.best_shot()
+        self.assertEqual(expected, 2.5)
+        solver.apply(cell, MISS)
+        self.assertEqual(len(solver.ids), 3)
+        with pytest.raises(Warning):
+            solver.apply(cell, HIT)
+        self.assertIsNone(EndgameSolver.from_view(0, 0, FLEET))
+        with pytest.raises(Warning):
+            EndgameSolver.from_view(dotted, hits, (3, 2))
+
+    def test_endgame_strategy(self):
+        rng = random.Random(3)
+        match = Match(TableShips(0, rng).ships, TableShips(15, rng).ships)
+        state = GameState(match.player1_ships, match.player2_ships)
+        strategy = EndgameStrategy(15, rng, time_budget=0.01)
+        while state.winner is None:
+            if state.player2_turn:
+                fired_block = next((x, y) for x in range(1, 11) for y in range(1, 11)
+                                   if (x, y) not in state.player1.ships_set and state.is_valid_shot((x, y)))
+            else:
+                fired_block = strategy.next_shot(state)
+                self.assertTrue(state.is_valid_shot(fired_block))
+            result = state.fire(fired_block)
+            match.shots.append((not state.player2_turn if result == MISS else state.player2_turn, fired_block, result))
+            if match.shots[-1][0] is False:
+                strategy.record(fired_block, result)
+        self.assertEqual(state.winner, 1)
+        self.assertIsNotNone(strategy.solver)
+        report = analyse_match(match, time_budget=0.01)
+        self.assertTrue(report)
+        for step in report:
+            self.assertEqual(step['player'], 1)
+            self.assertLessEqual(step['best_expected'], step['expected'] + 1e-9)
+
 
 if __name__ == '__main__':
     unittest.main()